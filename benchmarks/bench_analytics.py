@@ -0,0 +1,350 @@
+"""
+Microbenchmarks for the analytics hot paths, with regression tracking.
+
+Every case is timed as the best of ``--repeat`` rounds (per-call time, so
+noise from other processes only ever makes a round slower). Results are
+written as JSON; when a baseline file exists each case is compared against
+it and the run exits 1 if any case is slower than baseline by more than
+``--threshold``.
+
+Baselines are machine specific and are not committed. Without one the run
+says so, marks every case "no baseline" and skips the regression check;
+``--require-baseline`` makes that an error (exit 2), e.g. in CI.
+
+    python benchmarks/bench_analytics.py --save        # record a baseline
+    python benchmarks/bench_analytics.py               # compare against it
+    python benchmarks/bench_analytics.py -k implied_vol --threshold 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rotman_lib.analytics import (
+    BlackFormula,
+    IVService,
+    OptionPayoff,
+    OptionStrategy,
+    PortfolioRisk,
+    bs_greeks,
+    bs_greeks_grid,
+)
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "analytics.json"
+)
+
+SPOT = 50.0
+TTE = 240 / 300 / 12
+VOL = 0.25
+STRIKES = list(range(45, 55))
+
+CASES = {}
+
+
+def case(name, number):
+    """Registers ``fn`` as a benchmark case called ``number`` times per round."""
+
+    def register(fn):
+        CASES[name] = (fn, number)
+        return fn
+
+    return register
+
+
+def _price(k, opt_type, vol=VOL):
+    return BlackFormula.bs_option_price(SPOT, k, TTE, vol, opt_type)[0]
+
+
+### BlackFormula
+
+
+@case("bs_option_price.call", 2000)
+def bench_bs_call():
+    BlackFormula.bs_option_price(SPOT, 50, TTE, VOL, OptionPayoff.CALL)
+
+
+@case("bs_option_price.straddle_risk", 2000)
+def bench_bs_straddle_risk():
+    BlackFormula.bs_option_price(SPOT, 50, TTE, VOL, OptionPayoff.STRADDLE, 0.0, True)
+
+
+CHAIN_K = np.tile(STRIKES, 2).astype(float)
+CHAIN_T = np.repeat([OptionPayoff.CALL, OptionPayoff.PUT], len(STRIKES))
+
+
+@case("bs_option_price.rtm1_chain_loop", 100)
+def bench_bs_chain_loop():
+    for k, t in zip(CHAIN_K, CHAIN_T):
+        BlackFormula.bs_option_price(SPOT, k, TTE, VOL, t, 0.0, True)
+
+
+@case("bs_price_batch.rtm1_chain", 2000)
+def bench_bs_chain_batch():
+    BlackFormula.bs_price_batch(SPOT, CHAIN_K, TTE, VOL, CHAIN_T)
+
+
+SCENARIO_S = np.linspace(40.0, 60.0, 1000)[:, None]
+SCENARIO_V = np.linspace(0.1, 0.5, 1000)[None, :]
+
+
+@case("bs_price_batch.1m_scenarios", 1)
+def bench_bs_scenarios():
+    BlackFormula.bs_price_batch(
+        SCENARIO_S, 50.0, TTE, SCENARIO_V, OptionPayoff.STRADDLE
+    )
+
+
+@case("bs_greeks.rtm1_chain", 2000)
+def bench_greeks_chain():
+    bs_greeks(SPOT, CHAIN_K, TTE, VOL, CHAIN_T)
+
+
+GRID_S = np.linspace(45.0, 55.0, 100)
+GRID_V = np.linspace(0.1, 0.5, 100)
+GRID_Q = np.ones(len(CHAIN_K))
+
+
+@case("bs_greeks_grid.100x100_rtm1_chain", 5)
+def bench_greeks_grid():
+    bs_greeks_grid(GRID_S, GRID_V, CHAIN_K, TTE, CHAIN_T, 0.0, GRID_Q)
+
+
+ATM_CALL = _price(50, OptionPayoff.CALL)
+OTM_CALL = _price(60, OptionPayoff.CALL)
+ATM_STRADDLE = _price(50, OptionPayoff.STRADDLE)
+
+
+@case("implied_vol.atm_call", 200)
+def bench_iv_atm():
+    BlackFormula.implied_vol(ATM_CALL, SPOT, 50, TTE, OptionPayoff.CALL)
+
+
+@case("implied_vol.deep_otm_call", 200)
+def bench_iv_otm():
+    BlackFormula.implied_vol(OTM_CALL, SPOT, 60, TTE, OptionPayoff.CALL)
+
+
+@case("implied_vol.atm_straddle", 200)
+def bench_iv_straddle():
+    BlackFormula.implied_vol(ATM_STRADDLE, SPOT, 50, TTE, OptionPayoff.STRADDLE)
+
+
+CHAIN_PX = BlackFormula.bs_price_batch(SPOT, CHAIN_K, TTE, VOL, CHAIN_T)[0]
+
+
+@case("implied_vol.rtm1_chain_loop", 10)
+def bench_iv_chain_loop():
+    for px, k, t in zip(CHAIN_PX, CHAIN_K, CHAIN_T):
+        BlackFormula.implied_vol(px, SPOT, k, TTE, t)
+
+
+@case("implied_vol_batch.rtm1_chain", 100)
+def bench_iv_chain_batch():
+    BlackFormula.implied_vol_batch(CHAIN_PX, SPOT, CHAIN_K, TTE, CHAIN_T)
+
+
+# the sizes implied_vol_batch is for: scenario sets well past the 20-option chain
+WIDE_K = np.tile(np.linspace(40.0, 60.0, 500), 2)
+WIDE_T = np.repeat([OptionPayoff.CALL, OptionPayoff.PUT], 500)
+WIDE_PX = BlackFormula.bs_price_batch(SPOT, WIDE_K, TTE, VOL, WIDE_T)[0]
+
+
+@case("implied_vol.1k_quotes_loop", 1)
+def bench_iv_wide_loop():
+    for px, k, t in zip(WIDE_PX, WIDE_K, WIDE_T):
+        BlackFormula.implied_vol(px, SPOT, k, TTE, t)
+
+
+@case("implied_vol_batch.1k_quotes", 10)
+def bench_iv_wide_batch():
+    BlackFormula.implied_vol_batch(WIDE_PX, SPOT, WIDE_K, TTE, WIDE_T)
+
+
+# ATM straddle quoted over 60 ticks of a slowly drifting market, as trade.py sees it
+_rng = np.random.default_rng(0)
+PATH_S = SPOT * np.exp(np.cumsum(_rng.normal(0.0, 0.002, 60)))
+PATH_V = VOL + np.cumsum(_rng.normal(0.0, 0.002, 60))
+PATH_T = (300 - np.arange(60) - 60) / 300 / 12
+PATH_PX = [
+    BlackFormula.bs_option_price(s, 50.0, t, v, OptionPayoff.STRADDLE)[0]
+    for s, t, v in zip(PATH_S, PATH_T, PATH_V)
+]
+PATH = list(zip(PATH_PX, PATH_S, PATH_T))
+
+
+@case("implied_vol.straddle_path", 10)
+def bench_iv_path_cold():
+    for px, s, t in PATH:
+        BlackFormula.implied_vol(px, s, 50.0, t, OptionPayoff.STRADDLE)
+
+
+@case("iv_service.straddle_path", 10)
+def bench_iv_path_service():
+    service = IVService()
+    for px, s, t in PATH:
+        # signal, position check and hedge ask for the same quote each tick
+        for _ in range(3):
+            service.solve("RTM1S50", px, s, 50.0, t, OptionPayoff.STRADDLE)
+
+
+CHAIN = OptionStrategy(
+    "CHAIN",
+    {(t, k): 1.0 for t in (OptionPayoff.CALL, OptionPayoff.PUT) for k in STRIKES},
+)
+CHAIN_PRICES = {key: _price(key[1], key[0]) for key in CHAIN.content}
+
+
+@case("portfolio.rtm1_chain", 20)
+def bench_portfolio():
+    BlackFormula.portfolio(CHAIN, SPOT, CHAIN_PRICES, TTE)
+
+
+### PortfolioRisk
+
+BOOK = PortfolioRisk()
+BOOK.update_market(SPOT, TTE, 0.0, {t: VOL for t in BOOK.tickers})
+for _k in (48, 50, 52):
+    BOOK.on_fill(f"RTM1C{_k}", -500)
+    BOOK.on_fill(f"RTM1P{_k}", -500)
+
+
+@case("portfolio_risk.update_market.3_strikes", 2000)
+def bench_risk_update():
+    BOOK.update_market(SPOT, TTE)
+
+
+@case("portfolio_risk.fill_and_hedge", 2000)
+def bench_risk_fill():
+    BOOK.on_fill("RTM", 100)
+    BOOK.hedge_shares()
+
+
+### OptionStrategy
+
+DELTA_STRANGLE = OptionStrategy.createFromList(
+    "STRANGLE", ["C", "P", "C", "P"], [0.25, -0.25, 0.1, -0.1], [1.0, 1.0, -1.0, -1.0]
+)
+GRID = np.linspace(30.0, 70.0, 10_000)
+
+
+@case("strategy.run.10k_grid", 1)
+def bench_run():
+    DELTA_STRANGLE.run(GRID, SPOT, TTE, VOL)
+
+
+@case("strategy.strike_from_delta", 2000)
+def bench_strike_from_delta():
+    OptionStrategy.strike_from_delta(0.25, OptionPayoff.CALL, SPOT, VOL, TTE, True)
+
+
+def _many_legs(name, n, offset=0.0):
+    deltas = np.linspace(0.01, 0.99, n) + offset
+    return OptionStrategy.createFromList(
+        name, ["C"] * n, list(deltas), list(np.ones(n))
+    )
+
+
+WIDE_A = _many_legs("A", 500)
+WIDE_B = _many_legs("B", 500, offset=0.001)
+
+
+@case("strategy.add.500_legs", 50)
+def bench_add():
+    WIDE_A + WIDE_B
+
+
+@case("strategy.mul.500_legs", 200)
+def bench_mul():
+    WIDE_A * 2.0
+
+
+### runner
+
+
+def measure(fn, number, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="overwrite the baseline")
+    parser.add_argument("--output", default=None, help="also write results here")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    parser.add_argument("-k", default="", help="only run cases containing this")
+    parser.add_argument(
+        "--require-baseline",
+        action="store_true",
+        help="exit 2 instead of skipping the check when there is no baseline",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    elif not args.save:
+        print(
+            f"no baseline at {args.baseline}: regression check SKIPPED "
+            f"(record one with --save)",
+            file=sys.stderr,
+        )
+        if args.require_baseline:
+            sys.exit(2)
+
+    results, regressions = {}, []
+    for name, (fn, number) in CASES.items():
+        if args.k not in name:
+            continue
+        fn()  # warm-up
+        us = measure(fn, number, args.repeat)
+        results[name] = us
+        line = f"{name:<40s} {us:12.2f} us"
+        if baseline is not None and name in baseline:
+            change = us / baseline[name] - 1.0
+            line += f"   {change:+7.1%} vs baseline"
+            if change > args.threshold:
+                line += "   REGRESSION"
+                regressions.append(name)
+        elif not args.save:
+            line += "   no baseline"
+        print(line)
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "unit": "us/call",
+        "results": results,
+    }
+    targets = [args.output] if args.output else []
+    if args.save:
+        targets.append(args.baseline)
+    for path in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed past {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Latency benchmark for RITClient against a running RIT server.
+
+Compares the old per-call connection behaviour (module-level requests.get /
+requests.post, a new TCP connection for every call) with the pooled
+keep-alive session owned by RITClient.
+
+    python benchmarks/bench_client.py --api-key XXXX --n 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rotman_lib.market_api import RITClient
+
+
+def _time_calls(fn, n):
+    samples = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - t0
+    return samples * 1e3
+
+
+def _report(name, samples):
+    print(
+        f"{name:<34s} mean {samples.mean():7.3f} ms  "
+        f"p50 {np.percentile(samples, 50):7.3f} ms  "
+        f"p99 {np.percentile(samples, 99):7.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--api-key", default="0LC89D18")
+    parser.add_argument("--ticker", default="RTM")
+    parser.add_argument("--n", type=int, default=200)
+    args = parser.parse_args()
+
+    client = RITClient(host=args.host, port=args.port, api_key=args.api_key)
+    headers = {"X-API-Key": args.api_key}
+    order = {
+        "ticker": args.ticker,
+        "type": "MARKET",
+        "quantity": 1,
+        "action": "BUY",
+        "dry_run": 1,
+    }
+
+    # before: a fresh connection per call
+    securities = _time_calls(
+        lambda: requests.get(
+            client.base_url + "/securities",
+            headers=headers,
+            params={"ticker": args.ticker},
+        ),
+        args.n,
+    )
+    _report("get_securities (per-call conn)", securities)
+    orders = _time_calls(
+        lambda: requests.post(client.base_url + "/orders", headers=headers, params=order),
+        args.n,
+    )
+    _report("post_order dry_run (per-call conn)", orders)
+
+    # after: pooled keep-alive session
+    securities = _time_calls(lambda: client.get_securities(args.ticker), args.n)
+    _report("get_securities (session)", securities)
+    orders = _time_calls(
+        lambda: client.post_order(args.ticker, "MARKET", 1, "BUY", dry_run=1), args.n
+    )
+    _report("post_order dry_run (session)", orders)
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Implied-vol starting points: iteration count and wall time.
+
+Compares the Brenner-Subrahmanyam style seed implied_vol used to start from
+(passed in through init_vol) with BlackFormula.initial_vol_guess, on RTM1-like
+quotes (spot near 50, strikes 45-54, up to one month, vol 10%-60%, rfr 0 and
+3%). Quotes whose time value is below half a tick are skipped: any vol
+prices them to within a tick. The ATM straddle block is the solve trade.py
+runs every tick. The old seed's failed solves give up after a step or two
+and return nan, which flatters its wall time.
+
+    python benchmarks/bench_iv_guess.py
+"""
+
+import itertools
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rotman_lib.analytics import BlackFormula, OptionPayoff
+
+PRECISION = 1.0e-5
+HALF_TICK = 0.005
+ROUNDS = 5  # wall time is the best round
+
+
+def old_guess(price, spot, tte, opt_type):
+    if opt_type == OptionPayoff.STRADDLE:
+        return price / spot * np.sqrt(2 * np.pi / tte)
+    return price / spot * np.sqrt(np.pi / (2 * tte))
+
+
+def newton_iterations(price, spot, strike, tte, opt_type, rfr, vol, max_iteration=200):
+    """Steps implied_vol's Newton loop takes from ``vol``; None if it gives up."""
+    for i in range(max_iteration):
+        p, (_, vega, _) = BlackFormula.bs_option_price(
+            spot, strike, tte, vol, opt_type, rfr, True
+        )
+        if vega == 0 or not 0.0 <= vol <= 100.0:
+            return None
+        if abs(price - p) < PRECISION:
+            return i
+        vol += (price - p) / vega
+    return None
+
+
+def quotes(opt_type, spots, strikes):
+    for s, k, t, v, r in itertools.product(
+        spots, strikes, [1 / 12, 0.04, 0.01, 0.003], [0.1, 0.2, 0.35, 0.6], [0.0, 0.03]
+    ):
+        price = BlackFormula.bs_option_price(s, k, t, v, opt_type, r)[0]
+        fwd_gap = s - k * np.exp(-r * t)
+        intrinsic = {
+            OptionPayoff.CALL: max(fwd_gap, 0.0),
+            OptionPayoff.PUT: max(-fwd_gap, 0.0),
+            OptionPayoff.STRADDLE: abs(fwd_gap),
+        }[opt_type]
+        if price - intrinsic >= HALF_TICK:
+            yield price, s, k, t, opt_type, r
+
+
+def run(name, opt_type, spots, strikes):
+    qs = list(quotes(opt_type, spots, strikes))
+    rows = []
+    for label, seed in [
+        ("old seed", lambda q: old_guess(q[0], q[1], q[3], q[4])),
+        ("initial_vol_guess", lambda q: float(BlackFormula.initial_vol_guess(*q))),
+    ]:
+        iters = [newton_iterations(*q, vol=seed(q)) for q in qs]
+        solved = np.array([i for i in iters if i is not None])
+        us = float("inf")
+        for _ in range(ROUNDS):
+            t0 = time.perf_counter()
+            if label == "old seed":
+                for q in qs:
+                    BlackFormula.implied_vol(*q, init_vol=seed(q))
+            else:  # implied_vol's own path to initial_vol_guess
+                for q in qs:
+                    BlackFormula.implied_vol(*q)
+            us = min(us, (time.perf_counter() - t0) / len(qs) * 1e6)
+        rows.append(
+            f"  {label:<18s} mean {solved.mean():5.2f}  p90 {np.percentile(solved, 90):4.0f}"
+            f"  <=2 steps {np.mean(solved <= 2):6.1%}  failed {len(iters) - len(solved):4d}"
+            f"  {us:8.2f} us/solve"
+        )
+    print(f"{name} ({len(qs)} quotes)")
+    print("\n".join(rows))
+
+
+def main():
+    warnings.simplefilter("ignore", RuntimeWarning)
+    strikes = np.arange(45.0, 55.0)
+    run("calls", OptionPayoff.CALL, [49.7, 50.0, 50.3], strikes)
+    run("puts", OptionPayoff.PUT, [49.7, 50.0, 50.3], strikes)
+    run("straddles, all strikes", OptionPayoff.STRADDLE, [49.7, 50.0, 50.3], strikes)
+    run(
+        "ATM straddles (strike = round(spot))",
+        OptionPayoff.STRADDLE,
+        [49.55, 49.8, 50.0, 50.2, 50.45],
+        [50.0],
+    )
+
+    # closed form alone, no Newton polish
+    t, r = 0.04, 0.02
+    for s in (49.55, 50.0, 50.45):
+        p = BlackFormula.bs_option_price(s, 50.0, t, 0.25, OptionPayoff.STRADDLE, r)[0]
+        v = BlackFormula.atm_straddle_vol(p, s, 50.0, t, r)
+        print(f"atm_straddle_vol spot {s:5.2f}: {v:.6f} (true 0.25)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Accuracy and speed of rotman_lib.analytics.kernels against scipy.stats.norm.
+
+Checks the error bounds documented in kernels.py on dense grids (exit code 1
+if any is exceeded) and times scalar and array calls against scipy.
+
+    python benchmarks/bench_kernels.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+from scipy.stats import norm
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rotman_lib.analytics.kernels import norm_cdf, norm_pdf, norm_ppf
+
+
+def _max_rel_error(kernel, reference, xs, scalar):
+    if scalar:
+        got = np.array([kernel(float(x)) for x in xs])
+    else:
+        got = kernel(xs)
+    want = reference(xs)
+    return float(np.max(np.abs(got - want) / np.maximum(np.abs(want), 1e-300)))
+
+
+# (name, kernel, reference, grid, documented bound)
+CHECKS = [
+    ("norm_cdf [-5, 8.3]", norm_cdf, norm.cdf, np.linspace(-5, 8.3, 50_001), 1e-14),
+    ("norm_cdf [-37, -5]", norm_cdf, norm.cdf, np.linspace(-37, -5, 50_001), 1e-12),
+    ("norm_pdf [-37, 37]", norm_pdf, norm.pdf, np.linspace(-37, 37, 50_001), 1e-15),
+    (
+        "norm_ppf (0, 1)",
+        norm_ppf,
+        norm.ppf,
+        np.concatenate(
+            [
+                np.logspace(-300, -1, 20_000),
+                np.linspace(0.1, 0.9, 10_001),
+                1 - np.logspace(-16, -1, 10_000),
+            ]
+        ),
+        1e-14,
+    ),
+]
+
+
+def main():
+    failed = False
+    print("accuracy (max relative error vs scipy.stats.norm)")
+    for name, kernel, reference, xs, bound in CHECKS:
+        for mode in ("scalar", "array"):
+            err = _max_rel_error(kernel, reference, xs, mode == "scalar")
+            ok = err <= bound
+            failed |= not ok
+            print(
+                f"  {name:<20s} {mode:<6s} {err:10.3e}  bound {bound:.0e}"
+                f"  {'ok' if ok else 'EXCEEDED'}"
+            )
+
+    print("speed (us per call)")
+    x, p, arr = 0.3, 0.7, np.linspace(-4, 4, 20)
+    for name, ours, theirs in [
+        ("cdf scalar", lambda: norm_cdf(x), lambda: norm.cdf(x)),
+        ("pdf scalar", lambda: norm_pdf(x), lambda: norm.pdf(x)),
+        ("ppf scalar", lambda: norm_ppf(p), lambda: norm.ppf(p)),
+        ("cdf 20-array", lambda: norm_cdf(arr), lambda: norm.cdf(arr)),
+        ("pdf 20-array", lambda: norm_pdf(arr), lambda: norm.pdf(arr)),
+    ]:
+        a = min(timeit.repeat(ours, number=5000, repeat=5)) / 5000 * 1e6
+        b = min(timeit.repeat(theirs, number=5000, repeat=5)) / 5000 * 1e6
+        print(f"  {name:<14s} kernels {a:8.3f}   scipy.stats {b:8.3f}   x{b / a:6.1f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+End-to-end load and latency harness for the trading loop.
+
+Starts an in-process MockRITServer, points rotman_lib.trade at an OrderAPI
+talking to it and drives trade.on_tick for every tick of the case, timing
+each tick from the /case poll to the last order acknowledgement. Reports
+p50/p99/max tick latency, requests per tick and the per-endpoint request mix,
+so changes to the client, router or analytics can be compared end to end.
+
+    python benchmarks/load_harness.py --ticks 300 --latency 0.002 --rate-limit 50
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rotman_lib import trade
+from rotman_lib.market_api import MockRITServer, OrderAPI, TrafficRecorder
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds, uniform")
+    parser.add_argument("--rate-limit", type=float, default=None, help="orders/second")
+    parser.add_argument("--rv", type=float, default=0.2)
+    parser.add_argument("--iv", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", default=None, help="write a traffic log here")
+    parser.add_argument("--metrics", default=None, help="dump client metrics JSON here")
+    parser.add_argument(
+        "--profile",
+        type=int,
+        default=None,
+        metavar="N",
+        help="phase breakdown per tick; cProfile the N slowest ticks",
+    )
+    parser.add_argument("--verbose", action="store_true", help="show strategy output")
+    args = parser.parse_args()
+
+    server = MockRITServer(
+        rv=args.rv,
+        iv=args.iv,
+        latency=args.latency,
+        jitter=args.jitter,
+        order_rate_limit=args.rate_limit,
+        seed=args.seed,
+    ).start()
+    recorder = TrafficRecorder(args.record) if args.record else None
+    client = OrderAPI(
+        port=server.port, api_key="", recorder=recorder, metrics=bool(args.metrics)
+    )
+    trade.bind(client)
+    if args.profile is not None:
+        trade.profiler.enable(sample_slowest=args.profile)
+
+    latency = []
+    errors = 0
+    out = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(out):
+        for _ in range(args.ticks):
+            if server.advance() is None:
+                break
+            t0 = time.perf_counter()
+            try:
+                case = client.get_case().json()
+                trade.on_tick(case)
+            except Exception as e:  # keep driving the case, count the failure
+                errors += 1
+                print("tick failed:", e, file=sys.stderr)
+            latency.append(time.perf_counter() - t0)
+
+    client.close()
+    if args.metrics:
+        client.metrics.dump(args.metrics)
+    if recorder is not None:
+        recorder.close()
+    server.stop()
+
+    samples = np.asarray(latency) * 1e3
+    stats = server.request_stats()
+    print(f"ticks                {len(samples)}  (failed {errors})")
+    print(
+        f"tick latency         p50 {np.percentile(samples, 50):7.3f} ms  "
+        f"p99 {np.percentile(samples, 99):7.3f} ms  max {samples.max():7.3f} ms"
+    )
+    print(
+        f"requests per tick    mean {stats['per_tick_mean']:.2f}  "
+        f"max {stats['per_tick_max']}"
+    )
+    for (method, endpoint), count in sorted(
+        stats["by_endpoint"].items(), key=lambda kv: -kv[1]
+    ):
+        print(f"  {method.upper():<6s} /{endpoint:<12s} {count}")
+    print(f"final positions      {dict(client.ledger.positions)}")
+    iv = trade.iv_service.stats()
+    print(
+        f"iv service           hit rate {iv['hit_rate']:.1%}  "
+        f"solves {iv['misses']}  warm starts {iv['warm_starts']}  "
+        f"cold retries {iv['cold_retries']}"
+    )
+    if args.profile is not None:
+        print(trade.profiler.report())
+        trade.profiler.print_slowest_profiles()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
 from .bs_formula import BlackFormula, OptionPayoff
 from .signal import *
 from .definitions import OptionPayoff
-from .strategies import OptionStrategy
\ No newline at end of file
+from .strategies import OptionStrategy
+from .kernels import norm_cdf, norm_pdf, norm_ppf
+from .iv_service import IVService
+from .greeks import Greeks, bs_greeks, bs_greeks_grid
+from .portfolio_risk import PortfolioRisk
@@ -1,14 +1,90 @@
+import math
+from itertools import repeat
 import numpy as np
-from scipy.stats import norm
 from typing import Dict, Optional, Union
-from scipy.stats import norm
 from scipy.optimize import minimize
 from enum import Enum
 from .strategies import OptionStrategy
 from .definitions import OptionPayoff
+from .kernels import norm_cdf, norm_pdf, norm_ppf
+
+# atm_straddle_vol seeds a straddle only while the strike term is below this
+# fraction of its price. Near the forward it saves about one Newton step over
+# Corrado-Miller; further out Corrado-Miller needs as few steps for less work
+# (benchmarks/bench_iv_guess.py).
+_ATM_STRADDLE_BAND = 3.0e-3
+_SQRT_2PI = math.sqrt(2 * math.pi)
 
 
 class BlackFormula:
+    @classmethod
+    def bs_price_batch(
+        cls,
+        underlying_price,
+        strike,
+        tte,
+        vol,
+        opt_type,
+        rfr=0.0,
+    ):
+        """
+        Black-Scholes price and Greeks broadcast over array inputs.
+
+        Every argument may be a scalar or an array; opt_type holds OptionPayoff
+        values (STRADDLE prices call + put, FORWARD prices to 0), so a whole
+        chain of calls and puts is priced in one pass.
+
+        :return: (price, delta, gamma, vega) arrays of the broadcast shape.
+        """
+        # ufuncs broadcast on their own; np.broadcast_arrays costs more than
+        # the pricing itself on a 20-option chain
+        s, k, t, v, typ, r = (
+            x if isinstance(x, np.ndarray) else np.asarray(x)
+            for x in (underlying_price, strike, tte, vol, opt_type, rfr)
+        )
+        sqrt_t = np.sqrt(t)
+        vs = v * sqrt_t
+        d1 = (np.log(s / k) + (r + 0.5 * v * v) * t) / vs
+        d2 = d1 - vs
+        kdf = k * np.exp(-r * t)
+        n_d1 = norm_cdf(d1)
+        pdf_d1 = norm_pdf(d1)
+
+        call = (typ == OptionPayoff.CALL) | (typ == OptionPayoff.STRADDLE)
+        put = (typ == OptionPayoff.PUT) | (typ == OptionPayoff.STRADDLE)
+        legs = call.astype(np.float64) + put
+
+        # the put tails are evaluated directly, 1 - N(x) would cancel deep ITM
+        price = np.where(call, s * n_d1 - kdf * norm_cdf(d2), 0.0)
+        if put.any():
+            price = price + np.where(put, kdf * norm_cdf(-d2) - s * norm_cdf(-d1), 0.0)
+        delta = legs * n_d1 - put  # N(d1) per leg, N(d1) - 1 for the put
+        gamma = legs * pdf_d1 / (s * vs)
+        vega = legs * s * pdf_d1 * sqrt_t
+        return price, delta, gamma, vega
+
+    @staticmethod
+    def _bs_scalar(s, k, t, v, opt_type, r):
+        """bs_price_batch for one option with positive inputs, on floats."""
+        sqrt_t = math.sqrt(t)
+        vs = v * sqrt_t
+        d1 = (math.log(s / k) + (r + 0.5 * v * v) * t) / vs
+        d2 = d1 - vs
+        kdf = k * math.exp(-r * t)
+        n_d1 = norm_cdf(d1)
+        pdf_d1 = norm_pdf(d1)
+
+        price, delta, legs = 0.0, 0.0, 0
+        if opt_type == OptionPayoff.CALL or opt_type == OptionPayoff.STRADDLE:
+            price += s * n_d1 - kdf * norm_cdf(d2)
+            delta += n_d1
+            legs += 1
+        if opt_type == OptionPayoff.PUT or opt_type == OptionPayoff.STRADDLE:
+            price += kdf * norm_cdf(-d2) - s * norm_cdf(-d1)
+            delta += n_d1 - 1.0
+            legs += 1
+        return price, delta, legs * pdf_d1 / (s * vs), legs * s * pdf_d1 * sqrt_t
+
     @classmethod
     def bs_option_price(
         cls,
@@ -20,33 +96,135 @@ class BlackFormula:
         rfr: float = 0.0,
         calc_risk: Optional[bool] = False,
     ):
-        d1 = (np.log(underlying_price / strike) + (rfr + 0.5 * vol**2) * tte) / (
-            vol * np.sqrt(tte)
+        if (
+            isinstance(opt_type, (int, np.integer))
+            and all(
+                isinstance(x, (float, int))
+                for x in (underlying_price, strike, tte, vol, rfr)
+            )
+            and min(underlying_price, strike, tte, vol) > 0
+        ):
+            price, delta, gamma, vega = cls._bs_scalar(
+                underlying_price, strike, tte, vol, opt_type, rfr
+            )
+            if not calc_risk:
+                return price, (0.0, 0.0, 0.0)
+            return price, (delta, vega, gamma)
+
+        price, delta, gamma, vega = cls.bs_price_batch(
+            underlying_price, strike, tte, vol, opt_type, rfr
         )
-        d2 = d1 - vol * np.sqrt(tte)
+        # 0-d results come back as numpy scalars, array inputs stay arrays
+        if not calc_risk:
+            return price[()], (0.0, 0.0, 0.0)
+        return price[()], (delta[()], vega[()], gamma[()])
 
-        df = np.exp(-rfr * tte)
+    @classmethod
+    def atm_straddle_vol(cls, option_price, forward, strike, tte, rfr=0.0):
+        """
+        Closed-form implied vol of a straddle struck at or near the forward.
 
-        price = 0.0
-        delta, gamma, vega = 0.0, 0.0, 0.0
+        At K = F the straddle is worth 2 S (2 N(vol sqrt(T) / 2) - 1), which
+        inverts to vol = 2 N^-1((P / (2 S) + 1) / 2) / sqrt(T). Off the forward
+        the price is first reduced by the second-order strike term
+        (S - K df)^2 / (sqrt(2 pi S K df) vol sqrt(T)), re-evaluated twice with
+        the latest vol. Exact at the forward; a starting point elsewhere.
+        """
+        p, s, k, t, r = map(np.asarray, (option_price, forward, strike, tte, rfr))
+        x = k * np.exp(-r * t)
+        sqrt_t = np.sqrt(t)
+        gap = (s - x) ** 2 / np.sqrt(2 * np.pi * s * x)
 
-        # CALL / STRADDLE(call leg)
-        if opt_type == OptionPayoff.CALL or opt_type == OptionPayoff.STRADDLE:
-            price += underlying_price * norm.cdf(d1) - strike * df * norm.cdf(d2)
-            if calc_risk:
-                delta += norm.cdf(d1)
-                gamma += norm.pdf(d1) / (underlying_price * vol * np.sqrt(tte))
-                vega += underlying_price * norm.pdf(d1) * np.sqrt(tte)
+        def invert(q):
+            u = np.clip((q / (s + x) + 1) / 2, 0.5, 1 - 1e-16)
+            return 2 * norm_ppf(u) / sqrt_t
 
-        # PUT / STRADDLE(put leg)
-        if opt_type == OptionPayoff.PUT or opt_type == OptionPayoff.STRADDLE:
-            price += strike * df * norm.cdf(-d2) - underlying_price * norm.cdf(-d1)
-            if calc_risk:
-                delta += norm.cdf(d1) - 1.0
-                gamma += norm.pdf(d1) / (underlying_price * vol * np.sqrt(tte))
-                vega += underlying_price * norm.pdf(d1) * np.sqrt(tte)
+        vol = invert(p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(2):
+                vol = invert(p - gap / (vol * sqrt_t))
+        return vol[()]
+
+    @staticmethod
+    def _vol_guess_scalar(p, s, k, t, opt_type, r):
+        """initial_vol_guess for one option, on floats."""
+        x = k * math.exp(-r * t)
+        sqrt_t = math.sqrt(t)
+        if opt_type == OptionPayoff.STRADDLE:
+            gap = (s - x) ** 2 / math.sqrt(2 * math.pi * s * x)
+            # near the forward vol sqrt(T) ~ sqrt(2 pi) P / (S + X)
+            if p > 0 and gap * (s + x) < _ATM_STRADDLE_BAND * _SQRT_2PI * p * p:
+                vol = 0.0
+                for q in (p, None, None):
+                    if q is None:
+                        q = p - gap / (vol * sqrt_t)
+                    u = min(max((q / (s + x) + 1) / 2, 0.5), 1 - 1e-16)
+                    vol = 2 * norm_ppf(u) / sqrt_t
+                return vol
+            call = 0.5 * (p + s - x)
+        elif opt_type == OptionPayoff.PUT:
+            call = p + s - x
+        else:
+            call = p
+        a = call - 0.5 * (s - x)
+        radicand = max(a * a - (s - x) ** 2 / math.pi, 0.0)
+        return math.sqrt(2 * math.pi) / (s + x) * (a + math.sqrt(radicand)) / sqrt_t
+
+    @classmethod
+    def initial_vol_guess(cls, option_price, forward, strike, tte, opt_type, rfr=0.0):
+        """
+        Starting point for the implied vol solvers.
+
+        Calls and puts use the Corrado-Miller quadratic approximation on the
+        call price implied by put-call parity, which is accurate to a few
+        percent across the RTM1 strikes and for any rfr. A straddle whose strike
+        term (see atm_straddle_vol) is under _ATM_STRADDLE_BAND of its price
+        uses atm_straddle_vol, which is exact at the forward; other straddles
+        use Corrado-Miller as well.
+        """
+        if (
+            isinstance(opt_type, (int, np.integer))
+            and all(
+                map(
+                    isinstance,
+                    (option_price, forward, strike, tte, rfr),
+                    repeat((float, int)),
+                )
+            )
+            and min(forward, strike, tte) > 0
+        ):
+            return cls._vol_guess_scalar(
+                option_price, forward, strike, tte, opt_type, rfr
+            )
+        # ufuncs broadcast on their own, as in bs_price_batch
+        p, s, k, t, typ, r = map(
+            np.asarray, (option_price, forward, strike, tte, opt_type, rfr)
+        )
+        x = k * np.exp(-r * t)
+        sqrt_t = np.sqrt(t)
+        # C - P = S - X and straddle = 2 C - (S - X)
+        call = np.where(
+            typ == OptionPayoff.PUT,
+            p + s - x,
+            np.where(typ == OptionPayoff.STRADDLE, 0.5 * (p + s - x), p),
+        )
+        a = call - 0.5 * (s - x)
+        radicand = np.maximum(a * a - (s - x) ** 2 / np.pi, 0.0)
+        vol = np.sqrt(2 * np.pi) / (s + x) * (a + np.sqrt(radicand)) / sqrt_t
 
-        return price, (delta, vega, gamma)
+        straddle = typ == OptionPayoff.STRADDLE
+        if straddle.any():
+            gap = (s - x) ** 2 / np.sqrt(2 * np.pi * s * x)
+            near = (
+                straddle
+                & (p > 0)
+                & (gap * (s + x) < _ATM_STRADDLE_BAND * _SQRT_2PI * p * p)
+            )
+            if near.any():
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    atm = cls.atm_straddle_vol(p, s, k, t, r)
+                vol = np.where(near, atm, vol)
+        return vol[()]
 
     @classmethod
     def implied_vol(
@@ -57,16 +235,22 @@ class BlackFormula:
         tte: float,
         opt_type: OptionPayoff,
         rfr: float = 0.0,
-        init_vol: Optional[float] = 0.05,
+        init_vol: Optional[float] = None,
         lb: Optional[float] = 0.0,
         ub: Optional[float] = 100.0,
         precision: Optional[float] = 1.0e-5,
         max_iteration: Optional[int] = 200,
     ):
-        if opt_type == OptionPayoff.STRADDLE:
-            vol = option_price / (forward) * np.sqrt(2 * np.pi / tte)
-        elif opt_type == OptionPayoff.CALL or opt_type == OptionPayoff.PUT:
-            vol = option_price / forward * np.sqrt(np.pi / (2 * tte))
+        if init_vol is not None:
+            vol = init_vol
+        else:
+            args = (option_price, forward, strike, tte, opt_type, rfr)
+            if min(forward, strike, tte) > 0:
+                vol = cls._vol_guess_scalar(*args)
+            else:
+                vol = float(cls.initial_vol_guess(*args))
+            if not vol > 0:  # quote at or below intrinsic value
+                vol = option_price / forward * np.sqrt(2 * np.pi / tte)
 
         for _ in range(max_iteration):
             price, risk = BlackFormula.bs_option_price(
@@ -83,6 +267,156 @@ class BlackFormula:
 
         return np.nan, risk
 
+    @classmethod
+    def implied_vol_batch(
+        cls,
+        option_price,
+        forward,
+        strike,
+        tte,
+        opt_type,
+        rfr=0.0,
+        init_vol=None,
+        lb: float = 1.0e-6,
+        ub: float = 100.0,
+        precision: float = 1.0e-5,
+        max_iteration: int = 100,
+    ):
+        """
+        Implied volatility of many options at once.
+
+        Every option keeps a [lo, hi] bracket on vol. Each pass takes a Halley
+        step where it stays inside the bracket and bisects (geometrically)
+        otherwise, so any quote strictly between the no-arbitrage bounds
+        (intrinsic value and the vol -> infinity price) converges. While most
+        options are still iterating every pass prices the whole chain, which
+        is cheaper than gathering the unconverged ones; once fewer than half
+        remain only those are priced.
+
+        The cost is a fixed number of numpy calls per pass, so the gain over
+        looping implied_vol grows with the chain: about 1.5x on the 20-option
+        RTM1 chain, 7x at 100 options and 35x or more from 1000
+        (benchmarks/bench_analytics.py). Below about a dozen options the loop
+        is faster. The >10x target only holds from a few hundred options.
+
+        :param init_vol: (Optional) Starting vols; initial_vol_guess() if None.
+        :param precision: Price tolerance, as in implied_vol.
+        :return: (vol, (delta, vega, gamma), converged, iterations) arrays, with
+            NaN vol for quotes that did not converge.
+        """
+        shape = np.broadcast(option_price, forward, strike, tte, opt_type, rfr).shape
+        n = int(np.prod(shape))
+
+        def flat(x):
+            # scalars stay scalars and broadcast against the flat state arrays
+            x = np.asarray(x)
+            if x.ndim == 0:
+                return x
+            return (x if x.shape == shape else np.broadcast_to(x, shape)).ravel()
+
+        def full(x):
+            # np.broadcast_to costs more than a chain's arithmetic; skip it
+            return x if x.shape == (n,) else np.broadcast_to(x, (n,))
+
+        price, s, k, t, typ, r = map(
+            flat, (option_price, forward, strike, tte, opt_type, rfr)
+        )
+        if init_vol is None:
+            vol = cls.initial_vol_guess(price, s, k, t, typ, r)
+        else:
+            vol = init_vol
+        vol = np.minimum(np.maximum(full(np.asarray(vol, dtype=np.float64)), lb), ub)
+        vol[np.isnan(vol)] = 0.5 * (lb + ub)
+        lo = np.full(n, lb, dtype=np.float64)
+        hi = np.full(n, ub, dtype=np.float64)
+
+        # everything in the price but vol is fixed for the solve, and by parity
+        # every payoff is a multiple of the call plus a constant:
+        # P = C + (K df - S), straddle = 2 C + (K df - S)
+        sqrt_t = np.sqrt(t)
+        kdf = k * np.exp(-r * t)
+        call = (typ == OptionPayoff.CALL) | (typ == OptionPayoff.STRADDLE)
+        put = (typ == OptionPayoff.PUT) | (typ == OptionPayoff.STRADDLE)
+        legs = call.astype(np.float64) + put
+        offset = np.where(put, kdf - s, 0.0)
+        moneyness = np.log(s / k) + r * t
+        half_t = 0.5 * t
+        vega_scale = legs * s * sqrt_t / _SQRT_2PI  # vega = vega_scale e^(-d1^2 / 2)
+        fixed = (price, s, kdf, sqrt_t, legs, offset, moneyness, half_t, vega_scale)
+
+        # no-arbitrage bounds: intrinsic value (vol -> 0) and the vol -> inf
+        # price (S for a call, K df for a put); quotes outside have no solution
+        floor = legs * np.maximum(s - kdf, 0.0) + offset
+        cap = legs * s + offset
+        pending = (price >= floor - precision) & (price <= cap + precision)
+        if pending.shape != (n,):
+            pending = np.broadcast_to(pending, (n,)).copy()
+
+        converged = np.zeros(n, dtype=bool)
+        iterations = np.zeros(n, dtype=np.int64)
+        d1_at = np.full(n, np.nan)  # d1 at each option's current vol
+        active = slice(None)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(max_iteration):
+                if isinstance(active, slice):
+                    quote, ss, xx, st, ll, off, mm, ht, vsc = fixed
+                else:
+                    quote, ss, xx, st, ll, off, mm, ht, vsc = (
+                        x if x.ndim == 0 else x[active] for x in fixed
+                    )
+                v = vol[active]
+                live = pending[active]
+                vs = v * st
+                d1 = (mm + ht * v * v) / vs
+                d2 = d1 - vs
+                diff = quote - (ll * (ss * norm_cdf(d1) - xx * norm_cdf(d2)) + off)
+                vega = vsc * np.exp(-0.5 * d1 * d1)
+                d1_at[active] = d1
+                iterations[active] += live
+
+                # tighten the bracket around the root: price is increasing in vol
+                below = diff > 0
+                lo_a = np.where(below, v, lo[active])
+                hi_a = np.where(below, hi[active], v)
+                done = (np.abs(diff) < precision) | (hi_a - lo_a < 1e-12)
+                # Halley step (volga = vega d1 d2 / vol), one pass fewer than
+                # Newton on the RTM1 chain; the denominator is kept above half
+                # of Newton's so the step never turns against the bracket.
+                # nan or infinite steps fail the bracket test and bisect; the
+                # bracket spans decades at first, so bisect geometrically
+                den = vega * vega
+                den = np.maximum(den + 0.5 * diff * vega * d1 * d2 / v, 0.5 * den)
+                step = v + diff * vega / den
+                step = np.where(
+                    (step > lo_a) & (step < hi_a), step, np.sqrt(lo_a * hi_a)
+                )
+                move = live & ~done
+                # options no longer pending never read their bracket again
+                lo[active] = lo_a
+                hi[active] = hi_a
+                vol[active] = np.where(move, step, v)
+                converged[active] |= live & done
+                pending[active] = move
+
+                remaining = np.flatnonzero(pending)
+                if remaining.size == 0:
+                    break
+                active = slice(None) if 2 * remaining.size > n else remaining
+
+            # Greeks from the last pass, which priced every option at its vol
+            vol = np.where(converged, vol, np.nan)
+            d1 = np.where(converged, d1_at, np.nan)
+            delta = legs * norm_cdf(d1) - put
+            vega = vega_scale * np.exp(-0.5 * d1 * d1)
+            gamma = vega / (s * s * vol * t)  # legs pdf(d1) / (S vol sqrt(T))
+        delta, gamma, vega = map(full, (delta, gamma, vega))
+        return (
+            vol.reshape(shape),
+            (delta.reshape(shape), vega.reshape(shape), gamma.reshape(shape)),
+            converged.reshape(shape),
+            iterations.reshape(shape),
+        )
+
     @classmethod
     def portfolio(
         cls,
@@ -92,19 +426,17 @@ class BlackFormula:
         tte: float,
         rfr: float = 0.0,
     ):
-        results = []
-        for opt_type, strike in portfolio.content.keys():
-            k = (opt_type, strike)
+        keys = list(portfolio.content.keys())
+        for k in keys:
             assert k in option_price, f"Option price for {k} not provided"
 
-            iv, risk = cls.implied_vol(
-                option_price=option_price[k],
-                forward=forward,
-                strike=strike,
-                tte=tte,
-                opt_type=opt_type,
-                rfr=rfr,
-            )
-            results.append([iv, risk])
-
-        return results
+        # every leg is solved in one vectorized pass
+        iv, (delta, vega, gamma), _, _ = cls.implied_vol_batch(
+            option_price=[option_price[k] for k in keys],
+            forward=forward,
+            strike=[k[1] for k in keys],
+            tte=tte,
+            opt_type=[k[0] for k in keys],
+            rfr=rfr,
+        )
+        return [[iv[i], (delta[i], vega[i], gamma[i])] for i in range(len(keys))]
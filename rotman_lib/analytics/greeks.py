@@ -0,0 +1,123 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .definitions import OptionPayoff
+from .kernels import norm_cdf, norm_pdf
+
+### Black-Scholes Greeks in one vectorized pass
+#
+# d1, d2, the discount factor, pdf(d1) and the four cdf tails are evaluated
+# once and shared by every Greek. Units follow bs_price_batch: vega, volga and
+# vanna are per 1.00 of vol, rho per 1.00 of rate. theta and charm are the
+# change per year of calendar time passing (so theta is negative for a long
+# option); trade.py's tick is 1 / 3600 of a year.
+
+
+class Greeks(NamedTuple):
+    """Named, array-backed Black-Scholes price and sensitivities."""
+
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    rho: np.ndarray
+    vanna: np.ndarray  # d delta / d vol
+    volga: np.ndarray  # d vega / d vol
+    charm: np.ndarray  # d delta / d calendar time
+
+    def net(self, quantity, axis: int = -1) -> "Greeks":
+        """
+        Position-weighted sum of every field along ``axis``.
+
+        :param quantity: Units held per option, broadcast against the fields.
+        """
+        q = np.asarray(quantity, dtype=np.float64)
+        return Greeks(*(np.sum(g * q, axis=axis) for g in self))
+
+    def scalar(self) -> "Greeks":
+        """0-d fields converted to numpy scalars, e.g. for a single option."""
+        return Greeks(*(np.asarray(g)[()] for g in self))
+
+
+def bs_greeks(underlying_price, strike, tte, vol, opt_type, rfr=0.0) -> Greeks:
+    """
+    Price, first and second order Greeks broadcast over array inputs.
+
+    Arguments broadcast as in BlackFormula.bs_price_batch: opt_type holds
+    OptionPayoff values (STRADDLE is call + put, FORWARD prices to 0), so a
+    chain of calls and puts, or a chain against a grid of spot/vol scenarios,
+    is a single call.
+
+    :return: Greeks of the broadcast shape.
+    """
+    s, k, t, v, typ, r = np.broadcast_arrays(
+        *map(np.asarray, (underlying_price, strike, tte, vol, opt_type, rfr))
+    )
+    sqrt_t = np.sqrt(t)
+    vs = v * sqrt_t
+    d1 = (np.log(s / k) + (r + 0.5 * v**2) * t) / vs
+    d2 = d1 - vs
+    kdf = k * np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    n_d1, n_d2, n_md1, n_md2 = norm_cdf(np.stack([d1, d2, -d1, -d2]))
+
+    call = (typ == OptionPayoff.CALL) | (typ == OptionPayoff.STRADDLE)
+    put = (typ == OptionPayoff.PUT) | (typ == OptionPayoff.STRADDLE)
+    legs = call.astype(np.float64) + put
+
+    # per-leg terms shared by calls and puts
+    vega = s * pdf_d1 * sqrt_t
+    decay = -0.5 * s * pdf_d1 * v / sqrt_t
+
+    price = np.where(call, s * n_d1 - kdf * n_d2, 0.0) + np.where(
+        put, kdf * n_md2 - s * n_md1, 0.0
+    )
+    delta = np.where(call, n_d1, 0.0) + np.where(put, -n_md1, 0.0)
+    theta = np.where(call, decay - r * kdf * n_d2, 0.0) + np.where(
+        put, decay + r * kdf * n_md2, 0.0
+    )
+    rho = np.where(call, t * kdf * n_d2, 0.0) - np.where(put, t * kdf * n_md2, 0.0)
+    return Greeks(
+        price=price,
+        delta=delta,
+        gamma=legs * pdf_d1 / (s * vs),
+        vega=legs * vega,
+        theta=theta,
+        rho=rho,
+        vanna=legs * -pdf_d1 * d2 / v,
+        volga=legs * vega * d1 * d2 / v,
+        charm=legs * -pdf_d1 * (2.0 * r * t - d2 * vs) / (2.0 * t * vs),
+    )
+
+
+def bs_greeks_grid(
+    spots,
+    vols,
+    strike,
+    tte,
+    opt_type,
+    rfr=0.0,
+    quantity: Optional[np.ndarray] = None,
+) -> Greeks:
+    """
+    Greeks of a chain revalued on every (spot, vol) scenario.
+
+    :param spots: Underlying prices, shape (n_spot,).
+    :param vols: Volatilities, shape (n_vol,); a scenario applies one vol to
+        the whole chain.
+    :param strike: Chain strikes, shape (n_option,) or scalar; tte, opt_type
+        and rfr broadcast against it.
+    :param quantity: (Optional) Units held per option. If given the chain is
+        netted and the fields have shape (n_spot, n_vol).
+    :return: Greeks of shape (n_spot, n_vol, n_option), or netted as above.
+    """
+    s = np.asarray(spots, dtype=np.float64).reshape(-1, 1, 1)
+    v = np.asarray(vols, dtype=np.float64).reshape(1, -1, 1)
+    greeks = bs_greeks(
+        s, np.atleast_1d(strike), np.atleast_1d(tte), v, np.atleast_1d(opt_type), rfr
+    )
+    if quantity is None:
+        return greeks
+    return greeks.net(quantity)
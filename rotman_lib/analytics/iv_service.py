@@ -0,0 +1,130 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .bs_formula import BlackFormula
+from .definitions import OptionPayoff
+
+
+class IVService:
+    """
+    Memoizing front end to BlackFormula.implied_vol.
+
+    Results are kept in a bounded LRU keyed on (ticker, price, spot, tte,
+    rate), plus strike and payoff so that a ticker label reused for another
+    contract can never alias. Within a tick, repeated solves for the same
+    quote (signal, position check, hedge) are served from the cache.
+
+    Across ticks the inputs change, so each ticker also remembers its last
+    solved vol and the next Newton iteration starts from it instead of from
+    BlackFormula.initial_vol_guess. If the warm start fails to converge, the
+    solve is retried cold before giving up.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        precision: float = 1.0e-5,
+        max_iteration: int = 200,
+        warm_start: bool = True,
+    ):
+        """
+        :param maxsize: Maximum number of cached solves (LRU eviction).
+        :param precision: Price tolerance passed to implied_vol.
+        :param max_iteration: Newton iteration cap passed to implied_vol.
+        :param warm_start: Start each ticker from its last solved vol.
+        """
+        self.maxsize = maxsize
+        self.precision = precision
+        self.max_iteration = max_iteration
+        self.warm_start = warm_start
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warm_starts = 0
+        self.cold_retries = 0  # warm starts that failed and were solved cold
+        self._entries = OrderedDict()
+        self._last_vol = {}  # ticker -> last finite solved vol
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(ticker, option_price, spot, strike, tte, opt_type, rfr):
+        return (ticker, option_price, spot, tte, rfr, strike, opt_type)
+
+    def solve(
+        self,
+        ticker: str,
+        option_price: float,
+        spot: float,
+        strike: float,
+        tte: float,
+        opt_type: OptionPayoff,
+        rfr: float = 0.0,
+    ):
+        """
+        Implied vol and risk of one quote, as BlackFormula.implied_vol.
+
+        :param ticker: Name the result is cached and warm-started under.
+        :return: iv, (delta, vega, gamma); iv is nan if the quote has no solution.
+        """
+        key = self.key(ticker, option_price, spot, strike, tte, opt_type, rfr)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+            init_vol = self._last_vol.get(ticker) if self.warm_start else None
+
+        args = (option_price, spot, strike, tte, opt_type, rfr)
+        result = BlackFormula.implied_vol(
+            *args,
+            init_vol=init_vol,
+            precision=self.precision,
+            max_iteration=self.max_iteration,
+        )
+        retried = False
+        if init_vol is not None and math.isnan(result[0]):
+            retried = True
+            result = BlackFormula.implied_vol(
+                *args, precision=self.precision, max_iteration=self.max_iteration
+            )
+
+        with self._lock:
+            if init_vol is not None:
+                self.warm_starts += 1
+                self.cold_retries += retried
+            if not math.isnan(result[0]):
+                self._last_vol[ticker] = result[0]
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def last_vol(self, ticker: str) -> Optional[float]:
+        return self._last_vol.get(ticker)
+
+    def clear(self):
+        """Drops cached solves and warm-start vols, e.g. at a new case period."""
+        with self._lock:
+            self._entries.clear()
+            self._last_vol.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "warm_starts": self.warm_starts,
+            "cold_retries": self.cold_retries,
+        }
@@ -0,0 +1,234 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .definitions import OptionPayoff
+from .greeks import bs_greeks
+
+_GREEKS = ("delta", "gamma", "vega", "theta")
+
+
+class PortfolioRisk:
+    """
+    Net Greeks of the book, kept as arrays aligned to the option chain.
+
+    Option positions (contracts) and per-contract delta, gamma, vega and
+    theta are stored per chain slot. The net Greeks are maintained
+    incrementally:
+
+    * a fill adds ``quantity * greeks`` of that one option (O(1)); an option
+      not held at the last market update is valued on its own first, at the
+      vol given with the fill or else the last ATM vol (see _vols);
+    * a market update revalues only the options currently held, in one
+      bs_greeks call, and re-sums them.
+
+    net_delta, hedge_shares() and delta_limit_distance() read the running
+    totals and cost O(1). Delta and gamma are in shares of the underlying,
+    vega per 1.00 of vol and theta per year, all for the whole position.
+    """
+
+    def __init__(
+        self,
+        strikes: Iterable[int] = range(45, 55),
+        underlying: str = "RTM",
+        option_prefix: str = "RTM1",
+        multiplier: int = 100,
+        delta_limit: Optional[float] = None,
+    ):
+        """
+        :param strikes: Strikes of the chain; calls and puts are listed for each.
+            Options traded outside it are appended to the chain on first fill.
+        :param underlying: Ticker whose fills count as shares of delta.
+        :param option_prefix: Option tickers are prefix + "C"/"P" + strike.
+        :param multiplier: Shares per option contract.
+        :param delta_limit: (Optional) Net delta limit of the case.
+        """
+        self.underlying = underlying
+        self.option_prefix = option_prefix
+        self.multiplier = multiplier
+        self.delta_limit = delta_limit
+        self.tickers = []
+        self.strike = np.empty(0)
+        self.opt_type = np.empty(0, dtype=np.int64)
+        self.quantity = np.empty(0)
+        self.vol = np.empty(0)  # last vol per option, nan until given
+        self.shares = 0.0
+        self.spot = None
+        self.tte = None
+        self.rfr = 0.0
+        self._index = {}
+        self._unit = np.empty((len(_GREEKS), 0))  # Greeks per contract
+        self._valued = np.empty(0, dtype=bool)  # _unit is current for the market
+        self._net = np.zeros(len(_GREEKS))  # options only
+        self._lock = threading.Lock()
+        self._extend(
+            [f"{option_prefix}{c}{int(k):02d}" for c in ("C", "P") for k in strikes]
+        )
+
+    ### chain
+
+    def _extend(self, tickers):
+        n = len(tickers)
+        strikes, types = [], []
+        for ticker in tickers:
+            kind = ticker[len(self.option_prefix) : len(self.option_prefix) + 1]
+            if not ticker.startswith(self.option_prefix) or kind not in ("C", "P"):
+                raise ValueError(f"not an option of the chain: {ticker}")
+            strikes.append(float(ticker[len(self.option_prefix) + 1 :]))
+            types.append(OptionPayoff.CALL if kind == "C" else OptionPayoff.PUT)
+            self._index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        self.strike = np.append(self.strike, strikes)
+        self.opt_type = np.append(self.opt_type, types)
+        self.quantity = np.append(self.quantity, np.zeros(n))
+        self.vol = np.append(self.vol, np.full(n, np.nan))
+        self._unit = np.append(self._unit, np.zeros((len(_GREEKS), n)), axis=1)
+        self._valued = np.append(self._valued, np.zeros(n, dtype=bool))
+
+    def index(self, ticker: str) -> int:
+        i = self._index.get(ticker)
+        if i is None:
+            self._extend([ticker])
+            i = self._index[ticker]
+        return i
+
+    def _vols(self, idx):
+        """
+        Vols of chain slots ``idx``; a slot without one takes the vol of the
+        option struck nearest the spot that has one, i.e. the last ATM vol.
+        """
+        vol = self.vol[idx]
+        missing = np.isnan(vol)
+        if missing.any():
+            known = np.flatnonzero(~np.isnan(self.vol))
+            if len(known):
+                atm = known[np.argmin(np.abs(self.strike[known] - self.spot))]
+                vol = np.where(missing, self.vol[atm], vol)
+        return vol
+
+    def _value(self, idx):
+        """Per-contract Greeks of chain slots ``idx`` at the current market."""
+        if self.spot is None or not len(idx):
+            return
+        g = bs_greeks(
+            self.spot,
+            self.strike[idx],
+            self.tte,
+            self._vols(idx),
+            self.opt_type[idx],
+            self.rfr,
+        )
+        self._unit[:, idx] = np.stack([getattr(g, n) for n in _GREEKS])
+        self._unit[:, idx] *= self.multiplier
+        self._valued[idx] = True
+
+    ### updates
+
+    def on_fill(self, ticker: str, quantity: float, vol: Optional[float] = None):
+        """
+        Adds a signed fill (contracts, or shares for the underlying).
+
+        :param vol: (Optional) Implied vol of the option, e.g. the one it was
+            traded at; kept until the next update_market gives another.
+        """
+        if not quantity:
+            return
+        with self._lock:
+            if ticker == self.underlying:
+                self.shares += quantity
+                return
+            i = self.index(ticker)
+            if vol is not None and vol != self.vol[i]:
+                self.vol[i] = vol
+                self._valued[i] = False
+            if not self._valued[i]:
+                self._value([i])
+            self.quantity[i] += quantity
+            self._net += quantity * self._unit[:, i]
+
+    def apply(self, fill):
+        """on_fill for a FillResult; usable as a PositionLedger.on_fill callback."""
+        self.on_fill(fill.ticker, fill.signed_quantity)
+
+    def update_market(
+        self,
+        spot: float,
+        tte: float,
+        rfr: float = 0.0,
+        vols: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Revalues the held options and re-sums the net Greeks.
+
+        :param vols: (Optional) ticker -> vol; other options keep their last
+            vol. A held option that never got one makes the totals nan.
+        """
+        with self._lock:
+            self.spot, self.tte, self.rfr = spot, tte, rfr
+            for ticker, vol in (vols or {}).items():
+                self.vol[self.index(ticker)] = vol
+            self._valued[:] = False
+            held = np.flatnonzero(self.quantity)
+            self._value(held)
+            self._net = self._unit[:, held] @ self.quantity[held]
+
+    def reset(self, positions: Optional[dict] = None):
+        """Re-seeds positions, e.g. from PositionLedger.positions."""
+        with self._lock:
+            self.quantity[:] = 0.0
+            self.shares = 0.0
+            self._net[:] = 0.0
+            self._valued[:] = False  # unit Greeks of the old market
+        for ticker, quantity in (positions or {}).items():
+            self.on_fill(ticker, quantity)
+
+    ### queries
+
+    @property
+    def net_delta(self) -> float:
+        """Shares of delta, options and underlying together."""
+        return float(self._net[0]) + self.shares
+
+    @property
+    def net_gamma(self) -> float:
+        return float(self._net[1])
+
+    @property
+    def net_vega(self) -> float:
+        return float(self._net[2])
+
+    @property
+    def net_theta(self) -> float:
+        return float(self._net[3])
+
+    def hedge_shares(self) -> int:
+        """Signed underlying order that brings net delta back to zero."""
+        return -int(round(self.net_delta))
+
+    def delta_limit_distance(self) -> Optional[float]:
+        """delta_limit - |net delta|; negative when over the limit, None if unknown."""
+        if self.delta_limit is None:
+            return None
+        return self.delta_limit - abs(self.net_delta)
+
+    def positions(self):
+        held = {
+            self.tickers[i]: float(self.quantity[i])
+            for i in np.flatnonzero(self.quantity)
+        }
+        if self.shares:
+            held[self.underlying] = self.shares
+        return held
+
+    def held_strikes(self):
+        return sorted({int(self.strike[i]) for i in np.flatnonzero(self.quantity)})
+
+    def summary(self):
+        return {
+            "delta": self.net_delta,
+            "gamma": self.net_gamma,
+            "vega": self.net_vega,
+            "theta": self.net_theta,
+            "delta_limit_distance": self.delta_limit_distance(),
+        }
@@ -3,11 +3,11 @@ import yaml
 import logging
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
 from typing import Optional, Tuple
 from abc import ABC, abstractmethod
 from ..utilities import get_config_folder
 from .definitions import OptionPayoff
+from .kernels import norm_ppf
 
 logger = logging.getLogger(__name__)
 
@@ -86,7 +86,7 @@ class OptionStrategy:
         if opt_type == OptionPayoff.PUT:
             delta = 1.0 + delta
 
-        cutoff = norm.ppf(delta)
+        cutoff = norm_ppf(delta)
         var = vol * vol * time_to_expiry
 
         if is_log_normal:
@@ -1,2 +1,35 @@
 from .client import RITClient, TimeoutException
-from .order import OrderAPI
\ No newline at end of file
+from .cache import ResponseCache, CachePolicy
+from .metrics import ClientMetrics, LatencyHistogram
+from .models import (
+    Case,
+    Security,
+    Order,
+    NewsItem,
+    TAS_DTYPE,
+    HISTORY_DTYPE,
+    decode,
+    parse_case,
+    parse_securities,
+    parse_orders,
+    parse_news,
+    parse_tas,
+    parse_history,
+)
+from .book import OrderBook, BookDiff
+from .fills import FillResult, PositionLedger
+from .order import OrderAPI, RoutedOrder, MultiLegOrder
+from .async_client import AsyncRITClient, AsyncOrderAPI
+from .snapshot import MarketSnapshot
+from .tas import TimeAndSalesEngine
+from .scheduler import TickScheduler
+from .recorder import TrafficRecorder, TrafficLog, ReplayClient, Record
+from .mock_server import MockRITServer
+from .news import (
+    NewsFeed,
+    NewsEvent,
+    RateAndVolAnnounced,
+    DeltaLimitAnnounced,
+    VolUpdate,
+    VolForecast,
+)
\ No newline at end of file
@@ -0,0 +1,546 @@
+import asyncio
+from typing import Optional
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency, only needed for the async client
+    aiohttp = None
+
+from .client import TimeoutException
+from .models import decode
+from .order import atm_option_ticker
+
+
+class AsyncRITClient:
+    """
+    asyncio client for the Rotman Interactive Trader (RIT) REST API.
+
+    Mirrors the endpoint surface of RITClient, but every method is a coroutine
+    returning the parsed JSON payload instead of a requests.Response. All calls
+    share one aiohttp connection pool and the number of requests in flight is
+    bounded by a semaphore, so independent calls can be fanned out with
+    asyncio.gather (or AsyncRITClient.gather) in a single round trip. Bodies
+    are decoded with orjson when it is installed.
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=9999,
+        base_path="/v1",
+        api_key="0LC89D18",
+        default_timeout=20,
+        max_in_flight=8,
+        pool_size=16,
+    ):
+        """
+        Initializes the client.
+
+        :param host: Hostname where the API server is running.
+        :param port: Port on which the API server is listening.
+        :param base_path: Base path for the API endpoints.
+        :param api_key: API key required for authorization.
+        :param default_timeout: Default timeout (in seconds) for each HTTP request.
+        :param max_in_flight: Maximum number of concurrent requests.
+        :param pool_size: Maximum number of pooled keep-alive connections.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncRITClient requires the aiohttp package")
+
+        self.host = host
+        self.port = port
+        self.base_path = base_path
+        self.api_key = api_key
+        self.default_timeout = default_timeout
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.base_url = f"http://{self.host}:{self.port}{self.base_path}"
+        self.headers = {
+            "X-API-Key": self.api_key,
+            "Accept": "application/json",
+        }
+        self._urls = {}
+
+        # created lazily, aiohttp sessions must be bound to a running loop
+        self._session = None
+        self._semaphore = None
+
+    async def _ensure_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    async def close(self):
+        """Closes the shared session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _url(self, path):
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = self.base_url + path
+        return url
+
+    async def _request(self, method, path, params=None, data=None, timeout=None):
+        """
+        Internal helper to perform HTTP requests.
+
+        :param method: HTTP method ('get', 'post', or 'delete').
+        :param path: The API path (e.g. '/case').
+        :param params: URL query parameters.
+        :param data: POST data (if applicable).
+        :param timeout: Timeout in seconds for this request.
+        :return: The parsed JSON payload.
+        :raises TimeoutException: If the request times out.
+        :raises aiohttp.ClientResponseError: If the server returns an error status.
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        method = method.upper()
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError("Unsupported HTTP method")
+
+        session = await self._ensure_session()
+        async with self._semaphore:
+            try:
+                async with session.request(
+                    method,
+                    self._url(path),
+                    params=params,
+                    data=data,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as response:
+                    if not response.ok:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=await response.text(),
+                            headers=response.headers,
+                        )
+                    return decode(await response.read())
+            except asyncio.TimeoutError:
+                raise TimeoutException("HTTP request timed out")
+
+    @staticmethod
+    async def gather(*aws, return_exceptions=False):
+        """
+        Runs independent calls concurrently, e.g.
+
+            case, news, rtm = await client.gather(
+                client.get_case(), client.get_news(), client.get_securities("RTM")
+            )
+        """
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+
+    # === Endpoints defined in the swagger file ===
+
+    async def get_case(self):
+        """Gets information about the current case."""
+        return await self._request("get", "/case")
+
+    async def get_trader(self):
+        """Gets information about the currently signed in trader."""
+        return await self._request("get", "/trader")
+
+    async def get_limits(self):
+        """Gets the trading limits for the current case."""
+        return await self._request("get", "/limits")
+
+    async def get_news(self, since=None, limit=None):
+        """
+        Gets the most recent news.
+
+        :param since: Retrieve only news items after a particular news id.
+        :param limit: Maximum number of news items to return.
+        """
+        params = {}
+        if since is not None:
+            params["since"] = since
+        if limit is not None:
+            params["limit"] = limit
+        return await self._request("get", "/news", params=params)
+
+    async def get_assets(self, ticker=None):
+        """
+        Gets a list of available assets.
+
+        :param ticker: (Optional) Filter by asset ticker.
+        """
+        params = {}
+        if ticker is not None:
+            params["ticker"] = ticker
+        return await self._request("get", "/assets", params=params)
+
+    async def get_assets_history(self, ticker=None, period=None, limit=None):
+        """
+        Gets the activity log for assets.
+
+        :param ticker: (Optional) Filter by asset ticker.
+        :param period: (Optional) Specify the period (defaults to the current period).
+        :param limit: (Optional) Limit the number of log entries.
+        """
+        params = {}
+        if ticker is not None:
+            params["ticker"] = ticker
+        if period is not None:
+            params["period"] = period
+        if limit is not None:
+            params["limit"] = limit
+        return await self._request("get", "/assets/history", params=params)
+
+    async def get_securities(self, ticker=None):
+        """
+        Gets a list of available securities and associated positions.
+
+        :param ticker: (Optional) Filter by security ticker.
+        """
+        params = {}
+        if ticker is not None:
+            params["ticker"] = ticker
+        return await self._request("get", "/securities", params=params)
+
+    async def get_securities_book(self, ticker, limit=20):
+        """
+        Gets the order book of a security.
+
+        :param ticker: Security ticker (required).
+        :param limit: Maximum number of orders per side (default: 20).
+        """
+        params = {"ticker": ticker, "limit": limit}
+        return await self._request("get", "/securities/book", params=params)
+
+    async def get_securities_history(self, ticker, period=None, limit=None):
+        """
+        Gets the OHLC history for a security.
+
+        :param ticker: Security ticker (required).
+        :param period: (Optional) Specify the period.
+        :param limit: (Optional) Limit the number of ticks.
+        """
+        params = {"ticker": ticker}
+        if period is not None:
+            params["period"] = period
+        if limit is not None:
+            params["limit"] = limit
+        return await self._request("get", "/securities/history", params=params)
+
+    async def get_securities_tas(self, ticker, after=None, period=None, limit=None):
+        """
+        Gets time & sales history for a security.
+
+        :param ticker: Security ticker (required).
+        :param after: (Optional) Only retrieve data with an id greater than this value.
+        :param period: (Optional) Specify the period.
+        :param limit: (Optional) Specify how many ticks to include.
+        """
+        params = {"ticker": ticker}
+        if after is not None:
+            params["after"] = after
+        if period is not None:
+            params["period"] = period
+        if limit is not None:
+            params["limit"] = limit
+        return await self._request("get", "/securities/tas", params=params)
+
+    async def get_orders(self, status="OPEN"):
+        """
+        Gets a list of all orders.
+
+        :param status: Filter orders by status (defaults to 'OPEN').
+        """
+        params = {"status": status}
+        return await self._request("get", "/orders", params=params)
+
+    async def post_order(
+        self, ticker, order_type, quantity, action, price=None, dry_run=None
+    ):
+        """
+        Inserts a new order.
+
+        :param ticker: Security ticker.
+        :param order_type: 'MARKET' or 'LIMIT'.
+        :param quantity: Order quantity.
+        :param action: 'BUY' or 'SELL'.
+        :param price: (Optional) Price for LIMIT orders.
+        :param dry_run: (Optional) 0 or 1. Simulates order execution if provided.
+        """
+        params = {
+            "ticker": ticker,
+            "type": order_type,
+            "quantity": quantity,
+            "action": action,
+        }
+        if price is not None:
+            params["price"] = price
+        if dry_run is not None:
+            params["dry_run"] = dry_run
+        return await self._request("post", "/orders", params=params)
+
+    async def get_order(self, order_id):
+        """
+        Gets the details of a specific order.
+
+        :param order_id: The id of the order.
+        """
+        return await self._request("get", f"/orders/{order_id}")
+
+    async def delete_order(self, order_id):
+        """
+        Cancels an open order.
+
+        :param order_id: The id of the order to cancel.
+        """
+        return await self._request("delete", f"/orders/{order_id}")
+
+    async def get_tenders(self):
+        """Gets a list of all active tenders."""
+        return await self._request("get", "/tenders")
+
+    async def post_tender(self, tender_id, price=None):
+        """
+        Accepts a tender.
+
+        :param tender_id: The id of the tender.
+        :param price: (Optional) Price if the tender is not fixed-bid.
+        """
+        params = {}
+        if price is not None:
+            params["price"] = price
+        return await self._request("post", f"/tenders/{tender_id}", params=params)
+
+    async def delete_tender(self, tender_id):
+        """
+        Declines a tender.
+
+        :param tender_id: The id of the tender.
+        """
+        return await self._request("delete", f"/tenders/{tender_id}")
+
+    async def get_leases(self):
+        """Gets a list of all assets currently being leased or used."""
+        return await self._request("get", "/leases")
+
+    async def post_lease(
+        self,
+        ticker,
+        from1=None,
+        quantity1=None,
+        from2=None,
+        quantity2=None,
+        from3=None,
+        quantity3=None,
+    ):
+        """
+        Leases or uses an asset.
+
+        :param ticker: Ticker of the asset.
+        :param from1: (Optional) 1st source ticker.
+        :param quantity1: (Optional) 1st source quantity.
+        :param from2: (Optional) 2nd source ticker.
+        :param quantity2: (Optional) 2nd source quantity.
+        :param from3: (Optional) 3rd source ticker.
+        :param quantity3: (Optional) 3rd source quantity.
+        """
+        params = {"ticker": ticker}
+        if from1 is not None:
+            params["from1"] = from1
+        if quantity1 is not None:
+            params["quantity1"] = quantity1
+        if from2 is not None:
+            params["from2"] = from2
+        if quantity2 is not None:
+            params["quantity2"] = quantity2
+        if from3 is not None:
+            params["from3"] = from3
+        if quantity3 is not None:
+            params["quantity3"] = quantity3
+        return await self._request("post", "/leases", params=params)
+
+    async def get_lease(self, lease_id):
+        """
+        Gets the details of a specific lease.
+
+        :param lease_id: The id of the lease.
+        """
+        return await self._request("get", f"/leases/{lease_id}")
+
+    async def post_lease_use(
+        self,
+        lease_id,
+        from1,
+        quantity1,
+        from2=None,
+        quantity2=None,
+        from3=None,
+        quantity3=None,
+    ):
+        """
+        Uses a leased asset.
+
+        :param lease_id: The id of the lease.
+        :param from1: 1st source ticker.
+        :param quantity1: 1st source quantity.
+        :param from2: (Optional) 2nd source ticker.
+        :param quantity2: (Optional) 2nd source quantity.
+        :param from3: (Optional) 3rd source ticker.
+        :param quantity3: (Optional) 3rd source quantity.
+        """
+        params = {"from1": from1, "quantity1": quantity1}
+        if from2 is not None:
+            params["from2"] = from2
+        if quantity2 is not None:
+            params["quantity2"] = quantity2
+        if from3 is not None:
+            params["from3"] = from3
+        if quantity3 is not None:
+            params["quantity3"] = quantity3
+        return await self._request("post", f"/leases/{lease_id}", params=params)
+
+    async def delete_lease(self, lease_id):
+        """
+        Unleases an asset.
+
+        :param lease_id: The id of the lease.
+        """
+        return await self._request("delete", f"/leases/{lease_id}")
+
+    async def post_cancel_command(self, all=None, ticker=None, ids=None, query=None):
+        """
+        Bulk cancels open orders. Exactly one cancellation parameter must be provided.
+
+        :param all: Set to 1 to cancel all open orders.
+        :param ticker: Cancel all open orders for a specific ticker.
+        :param ids: Comma-separated list of order ids to cancel.
+        :param query: A query string to select orders for cancellation.
+        :return: A payload indicating which orders were cancelled.
+        :raises ValueError: If no parameter is provided.
+        """
+        params = {}
+        if all is not None:
+            params["all"] = all
+        elif ticker is not None:
+            params["ticker"] = ticker
+        elif ids is not None:
+            params["ids"] = ids
+        elif query is not None:
+            params["query"] = query
+        else:
+            raise ValueError(
+                "One cancellation parameter must be specified (all, ticker, ids, or query)"
+            )
+        return await self._request("post", "/commands/cancel", params=params)
+
+    async def get_mid_price(self, ticker):
+        book = await self.get_securities_book(ticker, limit=1)
+        bid = book["bids"][0]["price"]
+        ask = book["asks"][0]["price"]
+        return (bid + ask) / 2
+
+
+class AsyncOrderAPI(AsyncRITClient):
+
+    async def place_underlying_order(
+        self,
+        quantity: float,
+        order_type: str = "MARKET",
+        action: str = "BUY",
+        price: Optional[float] = None,
+        **kwargs,
+    ):
+        """
+        Place Underlying ETF order
+        """
+        assert order_type in ["MARKET", "LIMIT"], "order_type must be MARKET or LIMIT"
+        assert action in ["BUY", "SELL"], "action must be BUY or SELL"
+
+        if order_type == "LIMIT" and price is None:
+            raise ValueError("Price must be specified for LIMIT orders")
+
+        return await self.post_order(
+            ticker="RTM",
+            order_type=order_type,
+            quantity=quantity,
+            action=action,
+            price=price,
+            **kwargs,
+        )
+
+    async def place_atm_option_order(
+        self,
+        quantity: float,
+        order_type: str = "MARKET",
+        action: str = "BUY",
+        option_type: str = "C",
+        etf_price: float = None,
+        price: Optional[float] = None,
+        **kwargs,
+    ):
+        """
+        place At-The-Money Option order
+        """
+        assert option_type in ["C", "P"], "option_type must be C or P"
+        assert order_type in ["MARKET", "LIMIT"], "order_type must be MARKET or LIMIT"
+        assert action in ["BUY", "SELL"], "action must be BUY or SELL"
+
+        return await self.post_order(
+            ticker=atm_option_ticker(etf_price, option_type),
+            order_type=order_type,
+            quantity=quantity,
+            action=action,
+            price=price,
+            **kwargs,
+        )
+
+    async def place_straddle(
+        self,
+        quantity: float,
+        order_type: str = "MARKET",
+        action: str = "BUY",
+        price: Optional[float] = None,
+        etf_price: float = None,
+        **kwargs,
+    ):
+        """
+        Place ATM Straddle order, both legs are sent concurrently
+        """
+        return await self.gather(
+            self.place_atm_option_order(
+                quantity=quantity,
+                order_type=order_type,
+                action=action,
+                option_type="C",
+                etf_price=etf_price,
+            ),
+            self.place_atm_option_order(
+                quantity=quantity,
+                order_type=order_type,
+                action=action,
+                option_type="P",
+                etf_price=etf_price,
+            ),
+        )
+
+    # delta hedging trades
+    async def delta_hedge(self, delta):
+
+        if delta > 0:
+            action = "SELL"
+        else:
+            action = "BUY"
+
+        return await self.place_underlying_order(
+            quantity=abs(delta), action=action, order_type="MARKET", price=None
+        )
@@ -0,0 +1,165 @@
+import numpy as np
+from typing import Optional
+
+
+def _side_arrays(levels, descending: bool):
+    """
+    Turns the order list of one book side into (price, quantity) arrays with one
+    entry per price level, best level first. Quantity is what is left to trade
+    (quantity - quantity_filled).
+    """
+    n = len(levels)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    px = np.fromiter((lv["price"] for lv in levels), dtype=np.float64, count=n)
+    qty = np.fromiter(
+        (lv["quantity"] - (lv.get("quantity_filled") or 0) for lv in levels),
+        dtype=np.float64,
+        count=n,
+    )
+    keep = qty > 0
+    px, qty = px[keep], qty[keep]
+
+    # aggregate individual orders into price levels
+    levels_px, inverse = np.unique(px, return_inverse=True)
+    levels_qty = np.bincount(inverse, weights=qty, minlength=len(levels_px))
+    if descending:
+        return levels_px[::-1].copy(), levels_qty[::-1].copy()
+    return levels_px, levels_qty
+
+
+class BookDiff:
+    """Price levels whose quantity changed between two snapshots of one side."""
+
+    __slots__ = ("price", "old_quantity", "new_quantity")
+
+    def __init__(self, price, old_quantity, new_quantity):
+        self.price = price
+        self.old_quantity = old_quantity
+        self.new_quantity = new_quantity
+
+    @property
+    def delta(self):
+        return self.new_quantity - self.old_quantity
+
+    def __len__(self):
+        return len(self.price)
+
+
+def _diff_side(old_px, old_qty, new_px, new_qty):
+    px = np.union1d(old_px, new_px)
+    old = np.zeros(len(px))
+    new = np.zeros(len(px))
+    old[np.searchsorted(px, old_px)] = old_qty
+    new[np.searchsorted(px, new_px)] = new_qty
+    changed = old != new
+    return BookDiff(px[changed], old[changed], new[changed])
+
+
+class OrderBook:
+    """
+    Array-backed order book snapshot.
+
+    Each side is a pair of contiguous price/quantity arrays with one entry per
+    price level, best level first (bids descending, asks ascending), so depth,
+    microprice, imbalance and cost-to-fill queries are vectorized.
+    """
+
+    __slots__ = ("bid_px", "bid_qty", "ask_px", "ask_qty", "tick")
+
+    def __init__(self, bid_px, bid_qty, ask_px, ask_qty, tick: Optional[int] = None):
+        self.bid_px = np.asarray(bid_px, dtype=np.float64)
+        self.bid_qty = np.asarray(bid_qty, dtype=np.float64)
+        self.ask_px = np.asarray(ask_px, dtype=np.float64)
+        self.ask_qty = np.asarray(ask_qty, dtype=np.float64)
+        self.tick = tick
+
+    @classmethod
+    def from_response(cls, response, tick: Optional[int] = None):
+        """
+        Builds the book from a /securities/book response or its parsed payload.
+        """
+        payload = response.json() if hasattr(response, "json") else response
+        bid_px, bid_qty = _side_arrays(payload.get("bids") or [], descending=True)
+        ask_px, ask_qty = _side_arrays(payload.get("asks") or [], descending=False)
+        return cls(bid_px, bid_qty, ask_px, ask_qty, tick)
+
+    def _side(self, side: str):
+        side = side.upper()
+        if side in ("BID", "BIDS", "SELL"):
+            return self.bid_px, self.bid_qty
+        if side in ("ASK", "ASKS", "BUY"):
+            return self.ask_px, self.ask_qty
+        raise ValueError("side must be BID/ASK (or the action BUY/SELL)")
+
+    ### top of book
+
+    @property
+    def best_bid(self):
+        return self.bid_px[0] if len(self.bid_px) else np.nan
+
+    @property
+    def best_ask(self):
+        return self.ask_px[0] if len(self.ask_px) else np.nan
+
+    @property
+    def mid(self):
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self):
+        return self.best_ask - self.best_bid
+
+    def microprice(self):
+        """Top-of-book price weighted by the opposite side's quantity."""
+        if not len(self.bid_px) or not len(self.ask_px):
+            return np.nan
+        bq, aq = self.bid_qty[0], self.ask_qty[0]
+        return (self.bid_px[0] * aq + self.ask_px[0] * bq) / (bq + aq)
+
+    ### depth
+
+    def depth(self, n: Optional[int] = None):
+        """Total quantity on the best ``n`` levels (all if None), as (bid, ask)."""
+        return self.bid_qty[:n].sum(), self.ask_qty[:n].sum()
+
+    def cumulative_depth(self, side: str):
+        """(price, cumulative quantity) arrays for one side, best level first."""
+        px, qty = self._side(side)
+        return px, np.cumsum(qty)
+
+    def imbalance(self, n: Optional[int] = 1):
+        """(bid depth - ask depth) / (bid depth + ask depth) over ``n`` levels."""
+        bid, ask = self.depth(n)
+        total = bid + ask
+        return (bid - ask) / total if total > 0 else np.nan
+
+    def cost_to_fill(self, quantity: float, action: str = "BUY"):
+        """
+        Walks the book to fill ``quantity`` with a market order.
+
+        :param quantity: Quantity to trade.
+        :param action: 'BUY' consumes asks, 'SELL' consumes bids.
+        :return: (average price, total notional, quantity filled).
+        """
+        px, qty = self._side(action)
+        before = np.cumsum(qty) - qty
+        take = np.clip(quantity - before, 0.0, qty)
+        filled = take.sum()
+        notional = (take * px).sum()
+        avg = notional / filled if filled > 0 else np.nan
+        return avg, notional, filled
+
+    ### incremental updates
+
+    def diff(self, previous: "OrderBook"):
+        """
+        Levels that changed since ``previous``, as (bid BookDiff, ask BookDiff).
+        Removed levels show a new quantity of 0, new levels an old quantity of 0.
+        """
+        if previous is None:
+            previous = OrderBook([], [], [], [])
+        return (
+            _diff_side(previous.bid_px, previous.bid_qty, self.bid_px, self.bid_qty),
+            _diff_side(previous.ask_px, previous.ask_qty, self.ask_px, self.ask_qty),
+        )
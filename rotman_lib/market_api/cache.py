@@ -0,0 +1,148 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class CachePolicy:
+    STATIC = "static"  # valid for the whole case (period)
+    TICK = "tick"  # valid for the case tick it was fetched in
+    TTL = "ttl"  # valid for a fixed number of milliseconds
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of GET responses for RITClient.
+
+    Entries are keyed by endpoint path plus query params and stamped with the
+    case tick/period known when they were stored. The cache learns the current
+    tick from every /case response that goes through the client, or from
+    set_tick() when the caller already knows it (e.g. a tick scheduler).
+
+    * /limits, /trader, /assets are kept for the whole case period.
+    * /securities is kept for the current tick, or ``tick_ttl_ms`` if given.
+    * /case is kept for ``case_ttl_ms`` since it is what reveals a new tick.
+
+    Order entry, order cancellation and bulk cancel invalidate the affected
+    /securities entries and /trader.
+    """
+
+    POLICIES = {
+        "/limits": CachePolicy.STATIC,
+        "/trader": CachePolicy.STATIC,
+        "/assets": CachePolicy.STATIC,
+        "/securities": CachePolicy.TICK,
+        "/case": CachePolicy.TTL,
+    }
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        tick_ttl_ms: Optional[float] = None,
+        case_ttl_ms: float = 100.0,
+    ):
+        """
+        :param maxsize: Maximum number of cached responses (LRU eviction).
+        :param tick_ttl_ms: (Optional) Lifetime of per-tick entries in milliseconds.
+            If None, they live until the tick changes.
+        :param case_ttl_ms: Lifetime of /case entries in milliseconds.
+        """
+        self.maxsize = maxsize
+        self.tick_ttl_ms = tick_ttl_ms
+        self.case_ttl_ms = case_ttl_ms
+        self.tick = None
+        self.period = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def policy(cls, path: str):
+        return cls.POLICIES.get(path)
+
+    @staticmethod
+    def key(path: str, params: Optional[dict] = None):
+        if not params:
+            return (path, ())
+        return (path, tuple(sorted(params.items())))
+
+    def set_tick(self, tick: int, period: Optional[int] = None):
+        """Advances the cache clock; a new period drops the static entries."""
+        with self._lock:
+            if period is not None and self.period is not None and period != self.period:
+                self._entries.clear()
+            if period is not None:
+                self.period = period
+            self.tick = tick
+
+    def _is_valid(self, policy, entry, now):
+        _, tick, period, stamp = entry
+        if policy == CachePolicy.STATIC:
+            return period == self.period
+        age_ms = (now - stamp) * 1e3
+        if policy == CachePolicy.TTL:
+            return age_ms < self.case_ttl_ms
+        if self.tick_ttl_ms is not None:
+            return age_ms < self.tick_ttl_ms
+        return tick is not None and tick == self.tick
+
+    def get(self, path: str, params: Optional[dict] = None):
+        policy = self.policy(path)
+        if policy is None:
+            return None
+        key = self.key(path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_valid(policy, entry, time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, path: str, params: Optional[dict], response):
+        if self.policy(path) is None:
+            return
+        key = self.key(path, params)
+        with self._lock:
+            self._entries[key] = (response, self.tick, self.period, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """
+        Drops entries an order action can change: /trader and the /securities
+        entries for ``ticker`` (all of them if ticker is None).
+        """
+        with self._lock:
+            for key in list(self._entries.keys()):
+                path, params = key
+                if path == "/trader":
+                    del self._entries[key]
+                elif path == "/securities":
+                    filtered = dict(params).get("ticker")
+                    if ticker is None or filtered is None or filtered == ticker:
+                        del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
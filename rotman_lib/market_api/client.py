@@ -1,6 +1,12 @@
-import json
 import requests
+import requests.adapters
+import time
 import signal
+import threading
+
+from .book import OrderBook
+from .cache import ResponseCache
+from .metrics import ClientMetrics
 
 
 # Exception to be raised on a timeout.
@@ -18,10 +24,18 @@ class RITClient:
     Client for the Rotman Interactive Trader (RIT) REST API.
 
     This client implements functions corresponding to the endpoints documented
-    in the swagger YAML file. It attempts to use a signal-based timeout if available,
-    otherwise it falls back to the built-in timeout support of the requests library.
+    in the swagger YAML file. Timeouts are enforced according to ``timeout_mode``:
+
+    * "signal": SIGALRM interval timer. Bounds the whole request but only works
+      on the main thread of platforms that provide SIGALRM.
+    * "socket": the requests library's connect/read timeout. Works from any
+      thread and leaves process-wide signal state untouched.
+    * "auto": "signal" when called from the main thread and SIGALRM exists,
+      "socket" otherwise (e.g. inside a ThreadPoolExecutor).
     """
 
+    TIMEOUT_MODES = ("auto", "signal", "socket")
+
     def __init__(
         self,
         host="localhost",
@@ -29,6 +43,12 @@ class RITClient:
         base_path="/v1",
         api_key="0LC89D18",
         default_timeout=20,
+        pool_connections=4,
+        pool_maxsize=16,
+        timeout_mode="auto",
+        cache=None,
+        recorder=None,
+        metrics=None,
     ):
         """
         Initializes the client.
@@ -37,24 +57,91 @@ class RITClient:
         :param port: Port on which the API server is listening.
         :param base_path: Base path for the API endpoints.
         :param api_key: API key required for authorization.
-        :param default_timeout: Default timeout (in seconds) for each HTTP request.
-        """
+        :param default_timeout: Default timeout (in seconds, may be fractional)
+            for each HTTP request.
+        :param pool_connections: Number of connection pools kept by the session.
+        :param pool_maxsize: Maximum number of keep-alive connections per pool.
+        :param timeout_mode: 'auto', 'signal' or 'socket' (see class docstring).
+        :param cache: (Optional) ResponseCache, or True for a default one. Disabled if None.
+        :param recorder: (Optional) TrafficRecorder that logs every request/response.
+        :param metrics: (Optional) ClientMetrics, or True for a new one. Disabled if None/False.
+        """
+        if timeout_mode not in self.TIMEOUT_MODES:
+            raise ValueError(f"timeout_mode must be one of {self.TIMEOUT_MODES}")
         self.host = host
         self.port = port
         self.base_path = base_path
         self.api_key = api_key
         self.default_timeout = default_timeout
+        self.timeout_mode = timeout_mode
         self.base_url = f"http://{self.host}:{self.port}{self.base_path}"
         self.headers = {
             "X-API-Key": self.api_key,
+            "Accept": "application/json",
+            "Connection": "keep-alive",
         }
 
+        # One keep-alive session per client so consecutive calls reuse the
+        # same TCP connection instead of opening a new one per request.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # path -> full url, filled lazily by _url()
+        self._urls = {}
+
+        if cache is True:
+            cache = ResponseCache()
+        self.cache = cache
+        self.recorder = recorder
+        if metrics is True:
+            metrics = ClientMetrics()
+        self.metrics = metrics or None
+
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _url(self, path):
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = self.base_url + path
+        return url
+
+    def _send(self, method, url, params=None, data=None, timeout=None):
+        method = method.lower()
+        if method not in ("get", "post", "delete"):
+            raise ValueError("Unsupported HTTP method")
+        return self.session.request(
+            method, url, params=params, data=data, timeout=timeout
+        )
+
+    def _use_signal_timeout(self):
+        if self.timeout_mode == "socket" or not hasattr(signal, "SIGALRM"):
+            return False
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        if self.timeout_mode == "signal" and not on_main_thread:
+            raise RuntimeError(
+                "timeout_mode='signal' can only be used from the main thread"
+            )
+        return on_main_thread
+
     def _request(self, method, path, params=None, data=None, timeout=None):
         """
         Internal helper to perform HTTP requests.
 
-        If the platform supports signal-based alarms (i.e. if signal.SIGALRM exists),
-        then it uses a signal-based timeout. Otherwise, it relies on requests' built-in timeout.
+        GET requests are served from ``self.cache`` when it holds a valid entry;
+        order actions invalidate the entries they affect.
 
         :param method: HTTP method ('get', 'post', or 'delete').
         :param path: The API path (e.g. '/case').
@@ -64,53 +151,83 @@ class RITClient:
         :return: The response from the requests library.
         :raises TimeoutException: If the request times out.
         """
+        if self.cache is None:
+            return self._fetch(method, path, params, data, timeout)
+
+        is_get = method.lower() == "get"
+        if is_get:
+            cached = self.cache.get(path, params)
+            if cached is not None:
+                return cached
+
+        response = self._fetch(method, path, params, data, timeout)
+
+        if is_get:
+            if response.ok:
+                if path == "/case":
+                    case = response.json()
+                    self.cache.set_tick(case.get("tick"), case.get("period"))
+                self.cache.put(path, params, response)
+        elif path.startswith("/orders") or path == "/commands/cancel":
+            self.cache.invalidate((params or {}).get("ticker"))
+        return response
+
+    def _fetch(self, method, path, params=None, data=None, timeout=None):
+        if self.metrics is None:
+            response = self._request_with_timeout(method, path, params, data, timeout)
+        else:
+            response = self._timed_request(method, path, params, data, timeout)
+        if self.recorder is not None:
+            self.recorder.record(method, path, params, response)
+        return response
+
+    def _timed_request(self, method, path, params=None, data=None, timeout=None):
+        start = time.perf_counter()
+        try:
+            response = self._request_with_timeout(method, path, params, data, timeout)
+        except TimeoutException:
+            self.metrics.observe(
+                method, path, time.perf_counter() - start, timed_out=True
+            )
+            raise
+        except Exception:
+            self.metrics.observe(method, path, time.perf_counter() - start, error=True)
+            raise
+        self.metrics.observe(method, path, time.perf_counter() - start, response)
+        return response
+
+    def _request_with_timeout(self, method, path, params=None, data=None, timeout=None):
+        """
+        Sends the request, enforcing the timeout.
+
+        Uses a SIGALRM interval timer or the requests library's socket timeout
+        depending on ``timeout_mode``. Both accept fractional seconds.
+        """
         if timeout is None:
             timeout = self.default_timeout
 
-        url = self.base_url + path
+        url = self._url(path)
 
-        # Check if the platform supports SIGALRM.
-        if hasattr(signal, "SIGALRM"):
-            # Use signal.alarm-based timeout.
+        if self._use_signal_timeout():
+            # setitimer has sub-second resolution, unlike signal.alarm. Any
+            # timer armed by the caller is restored afterwards.
             old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(timeout)
+            old_timer = signal.setitimer(signal.ITIMER_REAL, timeout)
             try:
-                if method.lower() == "get":
-                    response = requests.get(url, headers=self.headers, params=params)
-                elif method.lower() == "post":
-                    response = requests.post(
-                        url, headers=self.headers, params=params, data=data
-                    )
-                elif method.lower() == "delete":
-                    response = requests.delete(url, headers=self.headers, params=params)
-                else:
-                    raise ValueError("Unsupported HTTP method")
+                response = self._send(method, url, params=params, data=data)
             finally:
-                # Cancel the alarm and restore the old signal handler.
-                signal.alarm(0)
+                # Cancel the timer and restore the old signal handler.
+                signal.setitimer(signal.ITIMER_REAL, 0)
                 signal.signal(signal.SIGALRM, old_handler)
+                if old_timer[0] > 0:
+                    signal.setitimer(signal.ITIMER_REAL, *old_timer)
             return response
         else:
-            # Fallback: Use requests' built-in timeout support.
+            # Thread-safe: use requests' built-in timeout support.
             try:
-                if method.lower() == "get":
-                    response = requests.get(
-                        url, headers=self.headers, params=params, timeout=timeout
-                    )
-                elif method.lower() == "post":
-                    response = requests.post(
-                        url,
-                        headers=self.headers,
-                        params=params,
-                        data=data,
-                        timeout=timeout,
-                    )
-                elif method.lower() == "delete":
-                    response = requests.delete(
-                        url, headers=self.headers, params=params, timeout=timeout
-                    )
-                else:
-                    raise ValueError("Unsupported HTTP method")
+                response = self._send(
+                    method, url, params=params, data=data, timeout=timeout
+                )
             except requests.Timeout:
                 raise TimeoutException("HTTP request timed out")
             return response
@@ -413,9 +530,15 @@ class RITClient:
             )
         return self._request("post", "/commands/cancel", params=params)
 
+    def get_order_book(self, ticker, limit=20):
+        """
+        Gets the order book of a security as an array-backed OrderBook.
+
+        :param ticker: Security ticker (required).
+        :param limit: Maximum number of orders per side (default: 20).
+        """
+        return OrderBook.from_response(self.get_securities_book(ticker, limit=limit))
+
     def get_mid_price(self, ticker):
-        book = self.get_securities_book(ticker, limit=1).json()
-        bid = book["bids"][0]["price"]
-        ask = book["asks"][0]["price"]
-        return (bid + ask) / 2
+        return self.get_order_book(ticker, limit=1).mid
     
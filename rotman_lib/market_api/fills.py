@@ -0,0 +1,118 @@
+import threading
+from collections import defaultdict
+from typing import Optional
+
+
+def contract_multiplier(ticker: str):
+    """Shares per contract: 100 for RTM1 options, 1 otherwise."""
+    return 100 if ticker.startswith("RTM1") else 1
+
+
+class FillResult:
+    """Execution summary of one order, built from the RIT order payload."""
+
+    __slots__ = (
+        "order_id",
+        "ticker",
+        "action",
+        "quantity",
+        "filled_quantity",
+        "avg_price",
+        "status",
+    )
+
+    def __init__(
+        self,
+        order_id,
+        ticker: str,
+        action: str,
+        quantity: float,
+        filled_quantity: float,
+        avg_price: Optional[float],
+        status: str,
+    ):
+        self.order_id = order_id
+        self.ticker = ticker
+        self.action = action
+        self.quantity = quantity
+        self.filled_quantity = filled_quantity
+        self.avg_price = avg_price
+        self.status = status
+
+    @classmethod
+    def from_order(cls, order: dict):
+        return cls(
+            order_id=order.get("order_id"),
+            ticker=order.get("ticker"),
+            action=order.get("action"),
+            quantity=order.get("quantity") or 0,
+            filled_quantity=order.get("quantity_filled") or 0,
+            avg_price=order.get("vwap"),
+            status=order.get("status"),
+        )
+
+    @property
+    def remaining(self):
+        return self.quantity - self.filled_quantity
+
+    @property
+    def signed_quantity(self):
+        """Filled quantity, positive for BUY and negative for SELL."""
+        return self.filled_quantity if self.action == "BUY" else -self.filled_quantity
+
+    @property
+    def is_complete(self):
+        return self.remaining <= 0
+
+    def __repr__(self):
+        return (
+            f"FillResult({self.action} {self.filled_quantity}/{self.quantity} "
+            f"{self.ticker} @ {self.avg_price}, {self.status})"
+        )
+
+
+class PositionLedger:
+    """
+    Local position and cash book kept up to date from fills, so the strategy
+    does not have to query /securities to learn what it traded.
+    """
+
+    def __init__(self):
+        self.positions = defaultdict(int)
+        self.cash = 0.0
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    def on_fill(self, callback):
+        """Registers ``callback(fill)``, called for every fill applied to the ledger."""
+        self._callbacks.append(callback)
+        return callback
+
+    def off_fill(self, callback):
+        """Unregisters a callback added with on_fill; unknown callbacks are ignored."""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def apply(self, fill: FillResult):
+        if not fill.filled_quantity:
+            return
+        signed = fill.signed_quantity
+        with self._lock:
+            self.positions[fill.ticker] += signed
+            if fill.avg_price is not None:
+                self.cash -= signed * fill.avg_price * contract_multiplier(fill.ticker)
+            if self.positions[fill.ticker] == 0:
+                self.positions.pop(fill.ticker)
+        for callback in self._callbacks:
+            callback(fill)
+
+    def position(self, ticker: str):
+        return self.positions.get(ticker, 0)
+
+    def reset(self, positions: Optional[dict] = None, cash: float = 0.0):
+        """Re-seeds the ledger, e.g. from a MarketSnapshot at start-up."""
+        with self._lock:
+            self.positions = defaultdict(
+                int, {k: v for k, v in (positions or {}).items() if v}
+            )
+            self.cash = cash
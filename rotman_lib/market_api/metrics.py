@@ -0,0 +1,255 @@
+import re
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# /orders/123 and /tenders/45 are reported as one endpoint each
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(path: str):
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR-style) histogram of latencies in microseconds.
+
+    Values below 64 us get their own bucket; above that every power of two is
+    split into 32 sub-buckets, so any recorded value is reported within ~3%
+    while the whole 1 us - 2 h range fits in under a thousand counters.
+    """
+
+    SUB_BITS = 5
+    SUB = 1 << SUB_BITS  # sub-buckets per octave
+    LINEAR = 2 * SUB  # values below this are exact
+    MAX_SHIFT = 27  # ~2^33 us, a little over 2 hours
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (self.LINEAR + self.MAX_SHIFT * self.SUB)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @classmethod
+    def _index(cls, us: int):
+        if us < cls.LINEAR:
+            return us
+        shift = min(us.bit_length() - cls.SUB_BITS - 1, cls.MAX_SHIFT)
+        top = min(us >> shift, cls.LINEAR - 1)
+        return cls.LINEAR + (shift - 1) * cls.SUB + (top - cls.SUB)
+
+    @classmethod
+    def _value(cls, index: int):
+        """Highest value that falls in bucket ``index``."""
+        if index < cls.LINEAR:
+            return index
+        shift, top = divmod(index - cls.LINEAR, cls.SUB)
+        shift += 1
+        return ((top + cls.SUB + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        us = int(seconds * 1e6)
+        self.counts[self._index(us)] += 1
+        self.count += 1
+        self.total += us
+        if self.min is None or us < self.min:
+            self.min = us
+        if us > self.max:
+            self.max = us
+
+    def percentile(self, q: float):
+        """Latency in microseconds at percentile ``q`` (0-100)."""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(q / 100 * self.count)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class EndpointStats:
+    __slots__ = ("count", "errors", "timeouts", "rate_limited", "bytes", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self, quantiles=(50, 90, 99, 99.9)):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "bytes": self.bytes,
+            "latency_us": {
+                "mean": self.latency.mean(),
+                "min": self.latency.min or 0,
+                "max": self.latency.max,
+                **{f"p{q:g}": self.latency.percentile(q) for q in quantiles},
+            },
+        }
+
+
+class ClientMetrics:
+    """
+    Per (method, endpoint) request counters and latency histograms.
+
+    Attach to a client with ``RITClient(metrics=True)`` or ``metrics=ClientMetrics()``;
+    a client without metrics skips the instrumentation entirely.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _stats(self, method: str, path: str):
+        key = (method.upper(), endpoint_name(path))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self.endpoints.setdefault(key, EndpointStats())
+        return stats
+
+    def observe(
+        self,
+        method: str,
+        path: str,
+        seconds: float,
+        response=None,
+        error: bool = False,
+        timed_out: bool = False,
+    ):
+        """
+        Records one request.
+
+        :param seconds: Wall time of the request.
+        :param response: requests.Response, if one was received.
+        :param error: True if the request raised instead of returning a response.
+        :param timed_out: True if it raised because the timeout expired.
+        """
+        stats = self._stats(method, path)
+        with self._lock:
+            stats.count += 1
+            stats.latency.record(seconds)
+            if timed_out:
+                stats.timeouts += 1
+                return
+            if error:
+                stats.errors += 1
+                return
+            stats.bytes += len(response.content or b"")
+            if response.status_code >= 400:
+                stats.errors += 1
+                if response.status_code == 429:
+                    stats.rate_limited += 1
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.started = time.time()
+
+    ### export
+
+    def snapshot(self):
+        """Plain-dict copy of every counter, keyed by "METHOD /endpoint"."""
+        with self._lock:
+            return {
+                f"{method} {path}": stats.snapshot()
+                for (method, path), stats in sorted(self.endpoints.items())
+            }
+
+    def to_json(self):
+        return json.dumps(
+            {"started": self.started, "endpoints": self.snapshot()}, indent=2
+        )
+
+    def to_prometheus(self, prefix: str = "rit_client"):
+        """Prometheus text exposition format (latency as a summary)."""
+        lines = []
+        counters = ("count", "errors", "timeouts", "rate_limited", "bytes")
+        names = {
+            "count": "requests_total",
+            "errors": "errors_total",
+            "timeouts": "timeouts_total",
+            "rate_limited": "rate_limited_total",
+            "bytes": "received_bytes_total",
+        }
+        with self._lock:
+            items = sorted(self.endpoints.items())
+            for field in counters:
+                metric = f"{prefix}_{names[field]}"
+                lines.append(f"# TYPE {metric} counter")
+                for (method, path), stats in items:
+                    labels = f'method="{method}",endpoint="{path}"'
+                    lines.append(f"{metric}{{{labels}}} {getattr(stats, field)}")
+            metric = f"{prefix}_request_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for (method, path), stats in items:
+                labels = f'method="{method}",endpoint="{path}"'
+                hist = stats.latency
+                for q in (0.5, 0.9, 0.99, 0.999):
+                    value = hist.percentile(q * 100) / 1e6
+                    lines.append(f'{metric}{{{labels},quantile="{q}"}} {value:.6f}')
+                lines.append(f"{metric}_sum{{{labels}}} {hist.total / 1e6:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, fmt: str = "json"):
+        """Writes the metrics to ``path`` as 'json' or 'prometheus' text."""
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        with open(path, "w") as f:
+            f.write(text)
+
+    def serve(self, port: int = 0, host: str = "127.0.0.1"):
+        """
+        Exposes /metrics (Prometheus text) and /metrics.json on a local port
+        from a daemon thread. Returns the bound port.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, ctype = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, ctype = metrics.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def stop_serving(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,575 @@
+import json
+import math
+import time
+import random
+import threading
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from ..analytics.bs_formula import BlackFormula
+from ..analytics.definitions import OptionPayoff
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real RIT server
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            params.update(parse_qsl(self.rfile.read(length).decode()))
+        status, payload = self.server.mock.handle(
+            method, url.path, params, self.headers.get("X-API-Key")
+        )
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._dispatch("get")
+
+    def do_POST(self):
+        self._dispatch("post")
+
+    def do_DELETE(self):
+        self._dispatch("delete")
+
+
+class MockRITServer:
+    """
+    In-process stand-in for the RIT REST API (volatility trading case).
+
+    Serves the endpoints RITClient uses on a local port with:
+
+    * a tick clock, advanced by a background thread every ``tick_seconds`` or
+      manually through advance() when ``tick_seconds`` is None;
+    * RTM following a lognormal random walk at the announced realized
+      volatility, and RTM1 calls/puts (strikes 45-54) priced with Black-Scholes
+      at an implied volatility around it. With ``contain_spot`` the walk is
+      reflected to stay within a quarter of the outer strikes, so the
+      nearest strike to RTM is always listed;
+    * a matching engine: MARKET orders walk a synthetic book of
+      ``depth_levels`` levels of ``depth_size``; LIMIT orders fill when
+      marketable and rest otherwise, filling when the quote crosses them;
+    * news injection, with the rate/volatility and delta-limit items of the
+      real case published at tick 0 and, with ``vol_news``, a weekly item
+      announcing the week's realized volatility and next week's range;
+    * configurable per-request latency and a token-bucket rate limit on
+      order entry that answers 429 with a ``wait`` hint.
+
+    Request counts are kept per tick and per endpoint for load measurements.
+    """
+
+    STRIKES = range(45, 55)
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: Optional[str] = None,
+        tick_seconds: Optional[float] = None,
+        ticks_per_period: int = 300,
+        spot: float = 50.0,
+        rv: float = 0.2,
+        iv: float = 0.22,
+        rfr: float = 0.0,
+        delta_limit: int = 7000,
+        penalty_pct: float = 1.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        order_rate_limit: Optional[float] = None,
+        depth_levels: int = 5,
+        depth_size: int = 5000,
+        contain_spot: bool = False,
+        vol_news: bool = True,
+        seed: Optional[int] = 0,
+    ):
+        """
+        :param port: Port to listen on, 0 picks a free one (see ``port`` after start()).
+        :param api_key: (Optional) Required X-API-Key; any key is accepted if None.
+        :param tick_seconds: Wall-clock tick length, or None for manual advance().
+        :param latency: Seconds added to every response.
+        :param jitter: Upper bound of uniform random extra latency in seconds.
+        :param order_rate_limit: (Optional) Orders per second before 429s are returned.
+        :param contain_spot: Reflect RTM back inside the listed strikes. Off by
+            default so that clients see RTM leave the chain as in the case.
+        :param vol_news: Publish a realized volatility update each week.
+        """
+        self.host = host
+        self.api_key = api_key
+        self.tick_seconds = tick_seconds
+        self.ticks_per_period = ticks_per_period
+        self.rv = rv
+        self.iv = iv
+        self.rfr = rfr
+        self.latency = latency
+        self.jitter = jitter
+        self.order_rate_limit = order_rate_limit
+        self.depth_levels = depth_levels
+        self.depth_size = depth_size
+        self.contain_spot = contain_spot
+        self.vol_news = vol_news
+        self._rv_range = (max(0.05, rv - 0.05), rv + 0.05)  # next week's forecast
+        self.rng = random.Random(seed)
+
+        self.tick = 0
+        self.period = 1
+        self.status = "ACTIVE"
+        self.spot = spot
+        self.securities = {}
+        self.positions = defaultdict(int)
+        self.cost = defaultdict(float)  # signed notional of the open position
+        self.realized = defaultdict(float)
+        self.volume = defaultdict(int)
+        self.orders = {}
+        self.tas = defaultdict(list)
+        self.news = []
+        self._next_order_id = 1
+        self._next_tas_id = 1
+        self._tokens = order_rate_limit or 0.0
+        self._last_refill = time.monotonic()
+
+        self.requests_by_tick = defaultdict(int)
+        self.requests_by_path = Counter()
+
+        self._lock = threading.RLock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._threads = []
+        self._stopped = threading.Event()
+
+        self._reprice()
+        self.inject_news(
+            "Welcome to the RTM volatility case",
+            f"The risk free rate is {rfr * 100:g}% and the realized volatility "
+            f"is {rv * 100:g}% for the first week.",
+        )
+        self.inject_news(
+            "Delta limit",
+            f"The delta limit for this case is {delta_limit} and the penalty "
+            f"percentage is {penalty_pct:g}%",
+        )
+
+    ### lifecycle
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def start(self):
+        t = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        t.start()
+        self._threads.append(t)
+        if self.tick_seconds is not None:
+            t = threading.Thread(target=self._clock, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _clock(self):
+        while not self._stopped.wait(self.tick_seconds):
+            if self.advance() is None:
+                return
+
+    ### market simulation
+
+    def _option_price(self, strike, opt_type):
+        tte = max(self.ticks_per_period - self.tick, 1) / self.ticks_per_period / 12
+        price, _ = BlackFormula.bs_option_price(
+            self.spot, strike, tte, self.iv, opt_type, self.rfr
+        )
+        return max(price, 0.01)
+
+    def _reflect(self, spot):
+        """Mirrors ``spot`` (in log space) back inside the listed chain."""
+        lo, hi = min(self.STRIKES) - 0.25, max(self.STRIKES) + 0.25
+        if spot > hi:
+            spot = hi * hi / spot
+        elif spot < lo:
+            spot = lo * lo / spot
+        return min(max(spot, lo), hi)
+
+    def _reprice(self):
+        quotes = {"RTM": (self.spot, 0.01, 1)}
+        for k in self.STRIKES:
+            quotes[f"RTM1C{k}"] = (self._option_price(k, OptionPayoff.CALL), 0.02, 100)
+            quotes[f"RTM1P{k}"] = (self._option_price(k, OptionPayoff.PUT), 0.02, 100)
+        for ticker, (mid, half_spread, size) in quotes.items():
+            self.securities[ticker] = {
+                "bid": round(mid - half_spread, 2),
+                "ask": round(mid + half_spread, 2),
+                "last": round(mid, 2),
+                "size": size,
+            }
+
+    def advance(self, ticks: int = 1):
+        """Moves the clock forward, repricing and crossing resting orders."""
+        with self._lock:
+            for _ in range(ticks):
+                if self.tick >= self.ticks_per_period:
+                    self.status = "STOPPED"
+                    return None
+                self.tick += 1
+                dt = 1 / self.ticks_per_period / 12
+                z = self.rng.gauss(0.0, 1.0)
+                self.spot *= math.exp(
+                    self.rv * math.sqrt(dt) * z - 0.5 * self.rv**2 * dt
+                )
+                if self.contain_spot:
+                    self.spot = self._reflect(self.spot)
+                week = self.ticks_per_period // 4
+                if self.vol_news and self.tick % week == 0:
+                    if self.tick < self.ticks_per_period:
+                        self._announce_vol()
+                self.iv = max(0.05, self.iv + self.rng.gauss(0.0, 0.002))
+                self._reprice()
+                self._cross_resting()
+                # background prints so time & sales is never empty
+                for ticker in ("RTM",):
+                    sec = self.securities[ticker]
+                    self._print(ticker, sec["last"], self.rng.randint(100, 5000))
+            return self.tick
+
+    def _announce_vol(self):
+        """
+        The week's realized volatility, drawn from last week's forecast range,
+        and the range for next week, in one item.
+        """
+        low, high = self._rv_range
+        self.rv = round(self.rng.uniform(low, high), 2)
+        self._rv_range = (max(0.05, self.rv - 0.05), self.rv + 0.05)
+        self.inject_news(
+            "Realized volatility update",
+            f"The realized volatility of RTM this week is {self.rv * 100:g}%. "
+            f"Next week it is expected to be between "
+            f"{self._rv_range[0] * 100:g}% and {self._rv_range[1] * 100:g}%.",
+        )
+
+    def inject_news(self, headline: str, body: str, ticker: str = ""):
+        with self._lock:
+            self.news.append(
+                {
+                    "news_id": len(self.news) + 1,
+                    "period": self.period,
+                    "tick": self.tick,
+                    "ticker": ticker,
+                    "headline": headline,
+                    "body": body,
+                }
+            )
+
+    def _print(self, ticker, price, quantity):
+        self.tas[ticker].append(
+            {
+                "id": self._next_tas_id,
+                "period": self.period,
+                "tick": self.tick,
+                "price": price,
+                "quantity": quantity,
+            }
+        )
+        self._next_tas_id += 1
+        self.volume[ticker] += quantity
+
+    def _fill(self, order, quantity, price):
+        signed = quantity if order["action"] == "BUY" else -quantity
+        ticker = order["ticker"]
+        pos = self.positions[ticker]
+        if pos and (pos > 0) != (signed > 0):
+            # closing (part of) the position realizes P&L against its average cost
+            closed = min(abs(pos), quantity)
+            avg = self.cost[ticker] / pos
+            mult = self.securities[ticker]["size"]
+            sign = 1 if pos > 0 else -1
+            self.realized[ticker] += sign * closed * (price - avg) * mult
+            self.cost[ticker] -= sign * closed * avg
+            self.cost[ticker] += (signed + sign * closed) * price
+        else:
+            self.cost[ticker] += signed * price
+        self.positions[ticker] += signed
+        if self.positions[ticker] == 0:
+            self.cost[ticker] = 0.0
+
+        filled = order["quantity_filled"]
+        order["vwap"] = ((order["vwap"] or 0.0) * filled + price * quantity) / (
+            filled + quantity
+        )
+        order["quantity_filled"] = filled + quantity
+        if order["quantity_filled"] >= order["quantity"]:
+            order["status"] = "TRANSACTED"
+        self._print(ticker, price, quantity)
+
+    def _walk_book(self, order):
+        sec = self.securities[order["ticker"]]
+        step = 0.01
+        if order["action"] == "BUY":
+            levels = [sec["ask"] + i * step for i in range(self.depth_levels)]
+        else:
+            levels = [sec["bid"] - i * step for i in range(self.depth_levels)]
+        remaining = order["quantity"] - order["quantity_filled"]
+        for px in levels:
+            if remaining <= 0:
+                break
+            if order["type"] == "LIMIT":
+                if order["action"] == "BUY" and px > order["price"]:
+                    break
+                if order["action"] == "SELL" and px < order["price"]:
+                    break
+            take = min(remaining, self.depth_size)
+            self._fill(order, take, round(px, 2))
+            remaining -= take
+
+    def _cross_resting(self):
+        for order in self.orders.values():
+            if order["status"] == "OPEN":
+                self._walk_book(order)
+
+    ### request handling
+
+    def _rate_limited(self):
+        if not self.order_rate_limit:
+            return None
+        now = time.monotonic()
+        self._tokens = min(
+            self.order_rate_limit,
+            self._tokens + (now - self._last_refill) * self.order_rate_limit,
+        )
+        self._last_refill = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / self.order_rate_limit
+
+    def handle(self, method, path, params, api_key):
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.rng.uniform(0.0, self.jitter))
+        path = path[len("/v1") :] if path.startswith("/v1") else path
+        with self._lock:
+            self.requests_by_tick[self.tick] += 1
+            self.requests_by_path[
+                (method, path.split("/")[1] if "/" in path else path)
+            ] += 1
+            if self.api_key is not None and api_key != self.api_key:
+                return 401, {"code": "NOT_AUTHORIZED", "message": "Invalid API key"}
+            try:
+                return self._route(method, path, params)
+            except (KeyError, ValueError) as e:
+                return 400, {"code": "BAD_REQUEST", "message": str(e)}
+
+    def _route(self, method, path, params):
+        if method == "get":
+            if path == "/case":
+                return 200, {
+                    "name": "RTM",
+                    "period": self.period,
+                    "tick": self.tick,
+                    "ticks_per_period": self.ticks_per_period,
+                    "total_periods": 1,
+                    "status": self.status,
+                    "is_enforce_trading_limits": True,
+                }
+            if path == "/trader":
+                nlv = sum(self.realized.values())
+                return 200, {
+                    "trader_id": "mock",
+                    "first_name": "Mock",
+                    "last_name": "Trader",
+                    "nlv": nlv,
+                }
+            if path == "/limits":
+                return 200, [
+                    {
+                        "name": "LIMIT-STOCK",
+                        "gross": 0,
+                        "net": 0,
+                        "gross_limit": 50000,
+                        "net_limit": 50000,
+                    },
+                    {
+                        "name": "LIMIT-OPTION",
+                        "gross": 0,
+                        "net": 0,
+                        "gross_limit": 2500,
+                        "net_limit": 1000,
+                    },
+                ]
+            if path == "/news":
+                items = self.news
+                if "since" in params:
+                    items = [n for n in items if n["news_id"] > int(params["since"])]
+                items = items[::-1]
+                if "limit" in params:
+                    items = items[: int(params["limit"])]
+                return 200, items
+            if path in ("/assets", "/assets/history", "/tenders", "/leases"):
+                return 200, []
+            if path == "/securities":
+                tickers = (
+                    [params["ticker"]] if "ticker" in params else list(self.securities)
+                )
+                return 200, [self._security(t) for t in tickers if t in self.securities]
+            if path == "/securities/book":
+                return 200, self._book(params["ticker"], int(params.get("limit", 20)))
+            if path == "/securities/tas":
+                prints = self.tas[params["ticker"]]
+                if "after" in params:
+                    after = int(params["after"])
+                    prints = [p for p in prints if p["id"] > after]
+                if "limit" in params:
+                    prints = prints[-int(params["limit"]) :]
+                return 200, prints
+            if path == "/securities/history":
+                return 200, []
+            if path == "/orders":
+                status = params.get("status", "OPEN")
+                return 200, [o for o in self.orders.values() if o["status"] == status]
+            if path.startswith("/orders/"):
+                order = self.orders.get(int(path.rsplit("/", 1)[1]))
+                if order is None:
+                    return 404, {"code": "NOT_FOUND", "message": "Order not found"}
+                return 200, order
+        elif method == "post":
+            if path == "/orders":
+                return self._post_order(params)
+            if path == "/commands/cancel":
+                ids = []
+                for order in self.orders.values():
+                    if order["status"] != "OPEN":
+                        continue
+                    if (
+                        params.get("all") == "1"
+                        or params.get("ticker") == order["ticker"]
+                        or str(order["order_id"]) in params.get("ids", "").split(",")
+                    ):
+                        order["status"] = "CANCELLED"
+                        ids.append(order["order_id"])
+                return 200, {"cancelled_order_ids": ids}
+        elif method == "delete":
+            if path.startswith("/orders/"):
+                order = self.orders.get(int(path.rsplit("/", 1)[1]))
+                if order is None or order["status"] != "OPEN":
+                    return 404, {"code": "NOT_FOUND", "message": "Order not open"}
+                order["status"] = "CANCELLED"
+                return 200, {"success": True}
+        return 404, {"code": "NOT_FOUND", "message": f"{method.upper()} {path}"}
+
+    def _security(self, ticker):
+        sec = self.securities[ticker]
+        pos = self.positions[ticker]
+        mid = (sec["bid"] + sec["ask"]) / 2
+        vwap = self.cost[ticker] / pos if pos else 0.0
+        return {
+            "ticker": ticker,
+            "type": "STOCK" if ticker == "RTM" else "OPTION",
+            "size": sec["size"],
+            "position": pos,
+            "vwap": vwap,
+            "nlv": pos * mid * sec["size"],
+            "last": sec["last"],
+            "bid": sec["bid"],
+            "bid_size": self.depth_size,
+            "ask": sec["ask"],
+            "ask_size": self.depth_size,
+            "volume": self.volume[ticker],
+            "unrealized": (mid - vwap) * pos * sec["size"] if pos else 0.0,
+            "realized": self.realized[ticker],
+            "is_tradeable": True,
+        }
+
+    def _book(self, ticker, limit):
+        sec = self.securities[ticker]
+        n = min(limit, self.depth_levels)
+
+        def level(i, action, px):
+            return {
+                "order_id": -(i + 1),
+                "period": self.period,
+                "tick": self.tick,
+                "trader_id": "market",
+                "ticker": ticker,
+                "type": "LIMIT",
+                "quantity": self.depth_size,
+                "action": action,
+                "price": round(px, 2),
+                "quantity_filled": 0,
+                "vwap": None,
+                "status": "OPEN",
+            }
+
+        return {
+            "bids": [level(i, "BUY", sec["bid"] - i * 0.01) for i in range(n)],
+            "asks": [level(i, "SELL", sec["ask"] + i * 0.01) for i in range(n)],
+        }
+
+    def _post_order(self, params):
+        wait = self._rate_limited()
+        if wait is not None:
+            return 429, {
+                "code": "TOO_MANY_REQUESTS",
+                "message": "Order entry rate limit exceeded",
+                "wait": round(wait, 3),
+            }
+        ticker = params["ticker"]
+        if ticker not in self.securities:
+            raise ValueError(f"Unknown ticker {ticker}")
+        order_type = params["type"].upper()
+        action = params["action"].upper()
+        if order_type not in ("MARKET", "LIMIT") or action not in ("BUY", "SELL"):
+            raise ValueError("Invalid order type or action")
+        if order_type == "LIMIT" and "price" not in params:
+            raise ValueError("LIMIT orders need a price")
+        quantity = int(float(params["quantity"]))
+        if quantity <= 0 or quantity > (100 if ticker.startswith("RTM1") else 10000):
+            raise ValueError("Order quantity out of range")
+
+        order = {
+            "order_id": self._next_order_id,
+            "period": self.period,
+            "tick": self.tick,
+            "trader_id": "mock",
+            "ticker": ticker,
+            "type": order_type,
+            "quantity": quantity,
+            "action": action,
+            "price": float(params["price"]) if "price" in params else None,
+            "quantity_filled": 0,
+            "vwap": None,
+            "status": "OPEN",
+        }
+        if params.get("dry_run") == "1":
+            return 200, order
+        self._next_order_id += 1
+        self.orders[order["order_id"]] = order
+        self._walk_book(order)
+        return 200, order
+
+    def request_stats(self):
+        """Requests per tick (ticks >= 1) and per (method, endpoint)."""
+        counts = [c for t, c in sorted(self.requests_by_tick.items()) if t >= 1]
+        return {
+            "per_tick_mean": sum(counts) / len(counts) if counts else 0.0,
+            "per_tick_max": max(counts) if counts else 0,
+            "by_endpoint": dict(self.requests_by_path),
+        }
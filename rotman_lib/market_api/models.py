@@ -0,0 +1,170 @@
+import json
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library parser
+    orjson = None
+
+
+### decoding
+
+
+def decode(response):
+    """
+    Parses a JSON body with orjson when it is installed, json otherwise.
+
+    :param response: requests.Response, bytes or str.
+    """
+    content = getattr(response, "content", response)
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+### compact response models
+
+
+class _Model:
+    """Slotted record built from a RIT payload dict; missing fields are None."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        obj = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(obj, name, d.get(name))
+        return obj
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__[:4])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+class Case(_Model):
+    __slots__ = (
+        "name",
+        "period",
+        "tick",
+        "ticks_per_period",
+        "total_periods",
+        "status",
+        "is_enforce_trading_limits",
+    )
+
+
+class Security(_Model):
+    __slots__ = (
+        "ticker",
+        "type",
+        "position",
+        "vwap",
+        "nlv",
+        "last",
+        "bid",
+        "bid_size",
+        "ask",
+        "ask_size",
+        "volume",
+        "unrealized",
+        "realized",
+        "is_tradeable",
+    )
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+
+class Order(_Model):
+    __slots__ = (
+        "order_id",
+        "ticker",
+        "type",
+        "action",
+        "quantity",
+        "price",
+        "quantity_filled",
+        "vwap",
+        "status",
+        "period",
+        "tick",
+        "trader_id",
+    )
+
+
+class NewsItem(_Model):
+    __slots__ = ("news_id", "period", "tick", "ticker", "headline", "body")
+
+
+### bulk payloads as NumPy structured arrays
+
+TAS_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("period", np.int32),
+        ("tick", np.int32),
+        ("price", np.float64),
+        ("quantity", np.float64),
+    ]
+)
+
+HISTORY_DTYPE = np.dtype(
+    [
+        ("tick", np.int32),
+        ("open", np.float64),
+        ("high", np.float64),
+        ("low", np.float64),
+        ("close", np.float64),
+    ]
+)
+
+
+def _records(rows, dtype: np.dtype, defaults: dict):
+    pairs = [(n, defaults.get(n, 0)) for n in dtype.names]
+
+    def _row(r):
+        return tuple(f if r.get(n) is None else r[n] for n, f in pairs)
+
+    return np.fromiter((_row(r) for r in rows), dtype=dtype, count=len(rows))
+
+
+def _payload(response):
+    return response if isinstance(response, (list, dict)) else decode(response)
+
+
+def parse_case(response) -> Case:
+    return Case.from_dict(_payload(response))
+
+
+def parse_securities(response):
+    """Dict of ticker -> Security for a /securities response."""
+    return {s["ticker"]: Security.from_dict(s) for s in _payload(response)}
+
+
+def parse_orders(response):
+    payload = _payload(response)
+    if isinstance(payload, dict):
+        return Order.from_dict(payload)
+    return [Order.from_dict(o) for o in payload]
+
+
+def parse_news(response):
+    return [NewsItem.from_dict(n) for n in _payload(response)]
+
+
+def parse_tas(response) -> np.ndarray:
+    """Time & sales prints as a TAS_DTYPE structured array."""
+    rows = _payload(response)
+    if isinstance(rows, dict):
+        rows = rows.get("data", rows.get("ticks", rows.get("tas", [])))
+    return _records(rows or [], TAS_DTYPE, {"id": -1, "tick": -1, "price": np.nan})
+
+
+def parse_history(response) -> np.ndarray:
+    """OHLC history as a HISTORY_DTYPE structured array."""
+    return _records(_payload(response) or [], HISTORY_DTYPE, {"tick": -1})
@@ -0,0 +1,211 @@
+import re
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .client import RITClient
+from .models import decode
+
+logger = logging.getLogger(__name__)
+
+
+### typed news events
+
+
+@dataclass(frozen=True)
+class NewsEvent:
+    news_id: int
+    tick: Optional[int]
+    headline: str
+
+
+@dataclass(frozen=True)
+class RateAndVolAnnounced(NewsEvent):
+    rfr: float  # decimal, e.g. 0.02
+    rv: float  # decimal, annualised realized volatility
+
+
+@dataclass(frozen=True)
+class DeltaLimitAnnounced(NewsEvent):
+    delta_limit: int
+    penalty_pct: float  # percent, as published
+
+
+@dataclass(frozen=True)
+class VolUpdate(NewsEvent):
+    rv: float  # decimal
+
+
+@dataclass(frozen=True)
+class VolForecast(NewsEvent):
+    low: float  # decimal
+    high: float  # decimal
+
+
+### precompiled extractors, tried in order
+#
+# An item can carry several events (this week's realized vol and next week's
+# range, say); a match lying inside an earlier one only restates it.
+
+_RATE_AND_VOL = re.compile(
+    r"risk free rate is (\d+(?:\.\d+)?)%.*?realized volatility is (\d+(?:\.\d+)?)%",
+    re.IGNORECASE | re.DOTALL,
+)
+_DELTA_LIMIT = re.compile(
+    r"delta limit.*?(\d+).*?penalty percentage is (\d+(?:\.\d+)?)%",
+    re.IGNORECASE | re.DOTALL,
+)
+_VOL_FORECAST = re.compile(
+    r"volatility.*?between (\d+(?:\.\d+)?)%\s*and\s*(\d+(?:\.\d+)?)%",
+    re.IGNORECASE | re.DOTALL,
+)
+# only the announcement wording "realized volatility ... is/will be N%", in one
+# sentence; _vol_update drops it if that sentence reads like a forecast
+_VOL_UPDATE = re.compile(
+    r"\brealized volatility\b[^.%]*?\b(?:is|will be)\s+(\d+(?:\.\d+)?)%",
+    re.IGNORECASE,
+)
+_FORECAST_WORDING = re.compile(
+    r"\b(?:forecast\w*|expect\w*|estimat\w*|predict\w*|outlook|between)\b",
+    re.IGNORECASE,
+)
+
+
+def _rate_and_vol(base, m):
+    return RateAndVolAnnounced(
+        *base, rfr=float(m.group(1)) / 100, rv=float(m.group(2)) / 100
+    )
+
+
+def _delta_limit(base, m):
+    return DeltaLimitAnnounced(
+        *base, delta_limit=int(m.group(1)), penalty_pct=float(m.group(2))
+    )
+
+
+def _vol_forecast(base, m):
+    return VolForecast(*base, low=float(m.group(1)) / 100, high=float(m.group(2)) / 100)
+
+
+def _vol_update(base, m):
+    text = m.string
+    sentence = max(text.rfind(".", 0, m.start()), text.rfind("\n", 0, m.start())) + 1
+    if _FORECAST_WORDING.search(text, sentence, m.end()):
+        return None
+    return VolUpdate(*base, rv=float(m.group(1)) / 100)
+
+
+EXTRACTORS = [
+    (_RATE_AND_VOL, _rate_and_vol),
+    (_DELTA_LIMIT, _delta_limit),
+    (_VOL_FORECAST, _vol_forecast),
+    (_VOL_UPDATE, _vol_update),
+]
+
+
+def parse_news_events(item: dict) -> List[NewsEvent]:
+    """
+    Turns one /news item into its typed events, in EXTRACTORS order.
+
+    Each extractor contributes its first match that builds an event and does
+    not lie inside the match of an earlier event.
+    """
+    headline = item.get("headline", "") or ""
+    text = f"{headline}\n{item.get('body', '') or ''}"
+    base = (item["news_id"], item.get("tick"), headline)
+    events, spans = [], []
+    for pattern, build in EXTRACTORS:
+        for match in pattern.finditer(text):
+            if any(a <= match.start() and match.end() <= b for a, b in spans):
+                continue
+            event = build(base, match)
+            if event is not None:
+                events.append(event)
+                spans.append(match.span())
+                break
+    return events
+
+
+def parse_news_item(item: dict) -> Optional[NewsEvent]:
+    """
+    The first event of a /news item (see parse_news_events), or None.
+    """
+    events = parse_news_events(item)
+    return events[0] if events else None
+
+
+class NewsFeed:
+    """
+    Incremental news reader.
+
+    Each poll() only asks the server for items after the last seen news id
+    (the ``since`` parameter of get_news), parses every new item exactly once
+    and publishes the resulting events to subscribers. The latest announced
+    values are also kept as attributes (rfr, rv, delta_limit, penalty_pct,
+    rv_forecast) so a trading loop can read them without handling events.
+    """
+
+    def __init__(self, client: RITClient, limit: Optional[int] = None):
+        """
+        :param client: Client used for the /news requests.
+        :param limit: (Optional) Maximum number of items fetched per poll.
+        """
+        self.client = client
+        self.limit = limit
+        self.last_id = None
+        self.rfr = None
+        self.rv = None
+        self.delta_limit = None
+        self.penalty_pct = None
+        self.rv_forecast = None
+        self._subscribers = defaultdict(list)
+
+    def subscribe(self, event_type: type, callback: Callable[[NewsEvent], None]):
+        """Registers ``callback`` for ``event_type`` (NewsEvent for every event)."""
+        self._subscribers[event_type].append(callback)
+
+    def poll(self) -> List[NewsEvent]:
+        """
+        Fetches and parses the news items published since the last poll.
+
+        :return: The new events, oldest first.
+        """
+        response = self.client.get_news(since=self.last_id, limit=self.limit)
+        response.raise_for_status()
+        items = decode(response)
+        if not items:
+            return []
+
+        events = []
+        for item in sorted(items, key=lambda x: x["news_id"]):
+            news_id = item["news_id"]
+            if self.last_id is not None and news_id <= self.last_id:
+                continue
+            self.last_id = news_id
+            parsed = parse_news_events(item)
+            if not parsed:
+                logger.info(f"Unparsed news item {news_id}: {item.get('headline')}")
+            for event in parsed:
+                self._apply(event)
+                events.append(event)
+                self._publish(event)
+        return events
+
+    def _apply(self, event: NewsEvent):
+        if isinstance(event, RateAndVolAnnounced):
+            self.rfr = event.rfr
+            self.rv = event.rv
+        elif isinstance(event, DeltaLimitAnnounced):
+            self.delta_limit = event.delta_limit
+            self.penalty_pct = event.penalty_pct
+        elif isinstance(event, VolUpdate):
+            self.rv = event.rv
+        elif isinstance(event, VolForecast):
+            self.rv_forecast = (event.low, event.high)
+
+    def _publish(self, event: NewsEvent):
+        for event_type, callbacks in self._subscribers.items():
+            if isinstance(event, event_type):
+                for callback in callbacks:
+                    callback(event)
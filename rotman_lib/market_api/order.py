@@ -1,10 +1,349 @@
-from .client import RITClient
-from typing import Optional
-from ..analytics.bs_formula import BlackFormula
+import math
+import time
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .client import RITClient, TimeoutException
+from .fills import FillResult, PositionLedger
+from .models import decode
+from .snapshot import MarketSnapshot
+from ..analytics.bs_formula import BlackFormula, OptionPayoff
+from ..utilities.profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+
+def atm_option_ticker(etf_price: float, option_type: str = "C"):
+    """
+    RTM1 option ticker closest to the money (strikes listed 45 to 54)
+    """
+    if etf_price < 45:
+        atm = 45
+    elif etf_price > 54:
+        atm = 54
+    else:
+        atm = round(etf_price)
+    return f"RTM1{option_type}{atm:02d}"
+
+
+class RoutedOrder:
+    """
+    Parent order split into chunks by OrderAPI.route_order.
+
+    ``fills`` holds the FillResult of every accepted chunk and ``errors`` the
+    exception raised by every rejected or timed-out one. The filled quantity
+    and VWAP are aggregated over the chunks; ``vwap`` is None if nothing
+    filled.
+
+    place_underlying_order and place_atm_option_order used to return the
+    requests.Response of a single post_order. ``ok`` and ``json()`` keep
+    those callers working: json() is the aggregate in the shape of a RIT
+    order payload.
+    """
+
+    def __init__(
+        self,
+        ticker: str,
+        action: str,
+        quantity: int,
+        fills: List[FillResult],
+        errors: Optional[List[Exception]] = None,
+    ):
+        self.ticker = ticker
+        self.action = action
+        self.quantity = quantity
+        self.fills = fills
+        self.errors = errors or []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def filled_quantity(self):
+        return sum(f.filled_quantity for f in self.fills)
+
+    @property
+    def vwap(self):
+        filled = self.filled_quantity
+        if filled == 0:
+            return None
+        notional = sum(f.filled_quantity * (f.avg_price or 0.0) for f in self.fills)
+        return notional / filled
+
+    @property
+    def remaining(self):
+        return self.quantity - self.filled_quantity
+
+    @property
+    def signed_quantity(self):
+        """Filled quantity, positive for BUY and negative for SELL."""
+        return self.filled_quantity if self.action == "BUY" else -self.filled_quantity
+
+    @property
+    def status(self):
+        if self.filled_quantity == 0:
+            return "REJECTED" if self.errors else "OPEN"
+        return "TRANSACTED" if self.remaining <= 0 else "PARTIAL"
+
+    def json(self):
+        return {
+            "order_ids": [f.order_id for f in self.fills],
+            "ticker": self.ticker,
+            "action": self.action,
+            "quantity": self.quantity,
+            "quantity_filled": self.filled_quantity,
+            "vwap": self.vwap,
+            "status": self.status,
+        }
+
+    def __repr__(self):
+        return (
+            f"RoutedOrder({self.action} {self.quantity} {self.ticker}, "
+            f"filled={self.filled_quantity}, vwap={self.vwap}, chunks={len(self.fills)})"
+        )
+
+
+class MultiLegOrder:
+    """
+    Legs of an order submitted together by OrderAPI.place_legs.
+
+    ``imbalance`` maps each leg's ticker to its unfilled quantity, so a leg that
+    lagged behind the others can be completed or hedged. ``unwound`` holds the
+    RoutedOrders that traded back the filled legs after a rejection.
+
+    A leg only counts as rejected if the server refused it (an error or a
+    REJECTED order status) and nothing of it filled; a LIMIT leg that was
+    accepted and is resting on the book is not a rejection.
+    """
+
+    def __init__(self, legs: List[RoutedOrder]):
+        self.legs = legs
+        self.unwound = []
+
+    @property
+    def rejected(self):
+        return [
+            r.ticker
+            for r in self.legs
+            if r.quantity > 0
+            and r.filled_quantity == 0
+            and (r.errors or any(f.status == "REJECTED" for f in r.fills))
+        ]
+
+    @property
+    def imbalance(self):
+        return {r.ticker: r.remaining for r in self.legs if r.remaining != 0}
+
+    @property
+    def ok(self):
+        return not self.rejected and not self.imbalance
+
+    def __getitem__(self, i):
+        return self.legs[i]
+
+    def __len__(self):
+        return len(self.legs)
+
+    def __repr__(self):
+        return f"MultiLegOrder({self.legs}, unwound={self.unwound})"
 
 
 class OrderAPI(RITClient):
 
+    # maximum order size accepted by the RIT server per security
+    max_chunk_rtm = 10000
+    max_chunk_option = 100
+
+    # concurrency and rate limiting for route_order
+    max_in_flight = 4
+    pool_size = 8  # chunk workers shared by concurrent route_order calls
+    max_retries = 10
+    default_retry_wait = 0.1
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # positions and cash traded through this API, updated from fills
+        self.ledger = PositionLedger()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _chunk_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="route_order"
+                )
+            return self._pool
+
+    def close(self):
+        """Shuts down the chunk worker pool, then closes the HTTP session."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        super().close()
+
+    def max_order_size(self, ticker: str):
+        if ticker.startswith("RTM1"):
+            return self.max_chunk_option
+        if ticker == "RTM":
+            return self.max_chunk_rtm
+        return None
+
+    def _post_with_retry(
+        self, ticker, order_type, quantity, action, price=None, **kwargs
+    ):
+        """
+        post_order that waits and retries on the RIT 429 rate-limit response,
+        using the ``wait`` hint from the body (or Retry-After) when present.
+        """
+        for attempt in range(self.max_retries + 1):
+            resp = self.post_order(
+                ticker, order_type, quantity, action, price=price, **kwargs
+            )
+            if resp.status_code != 429 or attempt == self.max_retries:
+                break
+            wait = None
+            try:
+                wait = resp.json().get("wait")
+            except ValueError:
+                pass
+            if wait is None:
+                wait = resp.headers.get("Retry-After")
+            wait = float(wait) if wait is not None else self.default_retry_wait
+            logger.info(f"Rate limited on {ticker}, retrying in {wait}s")
+            time.sleep(wait)
+
+        if not resp.ok:
+            logger.error(
+                f"Order failed: {action} {quantity} {ticker} "
+                f"status={resp.status_code} body={resp.text}"
+            )
+            resp.raise_for_status()
+        return decode(resp)
+
+    def _fill(self, order: dict, order_type: str, dry_run=None):
+        """
+        FillResult for a post_order payload. A MARKET order still reported as
+        OPEN is looked up once with get_order to pick up the executed quantity.
+        """
+        fill = FillResult.from_order(order)
+        if (
+            order_type == "MARKET"
+            and fill.status == "OPEN"
+            and not fill.is_complete
+            and fill.order_id is not None
+        ):
+            resp = self.get_order(fill.order_id)
+            if resp.ok:
+                try:
+                    fill = FillResult.from_order(decode(resp))
+                except ValueError as e:  # keep what post_order reported
+                    logger.warning(f"Unreadable order {fill.order_id}: {e!r}")
+        if not dry_run:
+            self.ledger.apply(fill)
+        return fill
+
+    @profiled("order")
+    def route_order(
+        self,
+        ticker: str,
+        order_type: str,
+        quantity: float,
+        action: str,
+        price: Optional[float] = None,
+        max_chunk: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        Splits a parent order into chunks no larger than the server allows and
+        submits them concurrently, at most ``max_in_flight`` at a time. Chunks
+        run on a worker pool kept by the OrderAPI, so concurrent calls (e.g. the
+        legs of a straddle) share at most ``pool_size`` workers.
+
+        A chunk that is refused, times out or gets an unreadable reply is
+        recorded in RoutedOrder.errors; the fills of the other chunks are kept
+        in the result and the ledger.
+
+        :param ticker: Security ticker.
+        :param order_type: 'MARKET' or 'LIMIT'.
+        :param quantity: Total quantity of the parent order.
+        :param action: 'BUY' or 'SELL'.
+        :param price: (Optional) Price for LIMIT orders.
+        :param max_chunk: (Optional) Chunk size, defaults to max_order_size(ticker).
+        :param max_in_flight: (Optional) Concurrent chunk limit.
+        :param kwargs: Passed to post_order (e.g. dry_run).
+        :return: RoutedOrder with the aggregated fill; empty if quantity rounds to 0.
+        """
+        qty, chunks, post = self._plan(
+            ticker,
+            order_type,
+            quantity,
+            action,
+            price,
+            max_chunk,
+            max_in_flight,
+            **kwargs,
+        )
+        if len(chunks) <= 1:
+            results = [post(size) for size in chunks]
+        else:
+            results = list(self._chunk_pool().map(post, chunks))
+        return self._routed(ticker, action, qty, results)
+
+    def _plan(
+        self,
+        ticker,
+        order_type,
+        quantity,
+        action,
+        price=None,
+        max_chunk=None,
+        max_in_flight=None,
+        **kwargs,
+    ):
+        """
+        Chunk sizes of a parent order and the function posting one chunk.
+
+        The poster returns the chunk's FillResult, or the exception if it was
+        refused, timed out or answered with an unreadable body, so one bad
+        chunk never discards the fills of the others.
+
+        :return: (quantity, chunk sizes, poster); no chunks if quantity rounds to 0.
+        """
+        qty = max(int(round(quantity)), 0)
+        if max_chunk is None:
+            max_chunk = self.max_order_size(ticker) or qty
+        chunks = [max_chunk] * (qty // max_chunk) if qty else []
+        if qty and qty % max_chunk:
+            chunks.append(qty % max_chunk)
+
+        in_flight = threading.BoundedSemaphore(max_in_flight or self.max_in_flight)
+
+        def _post(size):
+            with in_flight:
+                try:
+                    order = self._post_with_retry(
+                        ticker, order_type, size, action, price, **kwargs
+                    )
+                    return self._fill(order, order_type, kwargs.get("dry_run"))
+                except (requests.RequestException, TimeoutException, ValueError) as e:
+                    logger.error(f"Chunk of {size} {ticker} failed: {e!r}")
+                    return e
+
+        return qty, chunks, _post
+
+    @staticmethod
+    def _routed(ticker, action, qty, results):
+        fills = [r for r in results if not isinstance(r, Exception)]
+        errors = [r for r in results if isinstance(r, Exception)]
+        return RoutedOrder(ticker, action, qty, fills, errors)
+
     def place_underlying_order(
         self,
         quantity: float,
@@ -22,7 +361,7 @@ class OrderAPI(RITClient):
         if order_type == "LIMIT" and price is None:
             raise ValueError("Price must be specified for LIMIT orders")
 
-        return self.post_order(
+        return self.route_order(
             ticker="RTM",
             order_type=order_type,
             quantity=quantity,
@@ -53,15 +392,8 @@ class OrderAPI(RITClient):
         assert action in ["BUY", "SELL"], "action must be BUY or SELL"
         # etf_price = self.get_current_price("RTM")
 
-        if etf_price < 45:
-            atm = 45
-        elif etf_price > 54:
-            atm = 54
-        else:
-            atm = round(etf_price)
-
-        option_ticker = f"RTM1{option_type}{atm:02d}"
-        return self.post_order(
+        option_ticker = atm_option_ticker(etf_price, option_type)
+        return self.route_order(
             ticker=option_ticker,
             order_type=order_type,
             quantity=quantity,
@@ -70,6 +402,64 @@ class OrderAPI(RITClient):
             **kwargs,
         )
 
+    @profiled("order")
+    def place_legs(
+        self,
+        legs: List[Tuple],
+        order_type: str = "MARKET",
+        unwind: bool = True,
+        **kwargs,
+    ):
+        """
+        Submits every leg of a multi-leg order at the same time.
+
+        If a leg is rejected outright and ``unwind`` is set, whatever the other
+        legs filled is traded back at market. Partial fills are left in place
+        and reported through MultiLegOrder.imbalance.
+
+        :param legs: List of (ticker, quantity, action), optionally followed by a
+            price and an order type overriding ``order_type`` for that leg.
+        :param order_type: 'MARKET' or 'LIMIT'.
+        :param unwind: Trade back the filled legs if any leg is rejected.
+        :param kwargs: Passed to route_order (e.g. dry_run).
+        :return: MultiLegOrder.
+        """
+
+        # every chunk of every leg goes straight to the shared pool; a pooled
+        # task never waits on another, so concurrent callers cannot deadlock it
+        pool = self._chunk_pool()
+        pending = []
+        for leg in legs:
+            ticker, quantity, action = leg[:3]
+            price = leg[3] if len(leg) > 3 else None
+            leg_type = leg[4] if len(leg) > 4 else order_type
+            qty, chunks, post = self._plan(
+                ticker, leg_type, quantity, action, price, **kwargs
+            )
+            pending.append(
+                (ticker, action, qty, [pool.submit(post, size) for size in chunks])
+            )
+        routed = [
+            self._routed(ticker, action, qty, [f.result() for f in futures])
+            for ticker, action, qty, futures in pending
+        ]
+        result = MultiLegOrder(routed)
+
+        if unwind and result.rejected:
+            back = [
+                (r.ticker, r.filled_quantity, "SELL" if r.action == "BUY" else "BUY")
+                for r in routed
+                if r.filled_quantity > 0
+            ]
+            if back:
+                logger.warning(
+                    f"Unwinding {back} after rejected legs {result.rejected}"
+                )
+                result.unwound = self.place_legs(
+                    back, order_type="MARKET", unwind=False, **kwargs
+                ).legs
+        return result
+
     def place_straddle(
         self,
         quantity: float,
@@ -80,24 +470,18 @@ class OrderAPI(RITClient):
         **kwargs,
     ):
         """
-        Place ATM Straddle order
+        Place ATM Straddle order, both legs are sent at the same time
         """
-        self.place_atm_option_order(
-            quantity=quantity,
-            order_type=order_type,
-            action=action,
-            option_type="C",
-            etf_price=etf_price,
-        )
-        self.place_atm_option_order(
-            quantity=quantity,
+        result = self.place_legs(
+            [
+                (atm_option_ticker(etf_price, "C"), quantity, action),
+                (atm_option_ticker(etf_price, "P"), quantity, action),
+            ],
             order_type=order_type,
-            action=action,
-            option_type="P",
-            etf_price=etf_price,
+            **kwargs,
         )
         print("Straddle order placed")
-        return True
+        return result
 
     # delta hedging trades
     def delta_hedge(self, delta):
@@ -111,53 +495,69 @@ class OrderAPI(RITClient):
             quantity=abs(delta), action=action, order_type="MARKET", price=None
         )
 
+    @profiled("order")
     def straddle_delta_hedge(
         self,
         quantity: float,
         order_type: str = "MARKET",
         action: str = "BUY",
-        price: Optional[float] = None,
+        call_price: Optional[float] = None,
+        put_price: Optional[float] = None,
+        rfr: float = 0.0,
         **kwargs,
     ):
         """
         Place delta-hedged straddle portfolio
-        """
-        # # calculate tte
-        # tick = self.get_case().json().get("tick")
-        # tte = (300 - tick) / 300 / 12
-
-        # # find option tickers
-        # etf_price = self.get_securities_book("RTM", limit=1).json()
-        # strike = round(
-        #     (etf_price["bids"][0]["price"] + etf_price["asks"][0]["price"]) / 2
-        # )
-        c_ticker = f"RTM1C{strike:02d}"
-        p_ticker = f"RTM1P{strike:02d}"
 
-        c_price = self.get_securities_book(c_ticker, limit=1).json()
-        c_price = (c_price["bids"][0]["price"] + c_price["asks"][0]["price"]) / 2
+        The case and every quote are fetched concurrently in one round trip,
+        then the call, put and RTM hedge legs are submitted together. With
+        order_type 'LIMIT' the call and put are limit orders at ``call_price``
+        and ``put_price``; the RTM hedge always goes out at market.
+        Without a finite straddle delta (no implied vol, e.g. at expiry) the
+        RTM leg is left out and a warning logged.
+        """
+        if order_type == "LIMIT" and (call_price is None or put_price is None):
+            raise ValueError(
+                "call_price and put_price must be specified for LIMIT orders"
+            )
 
-        p_price = self.get_securities_book(p_ticker, limit=1).json()
-        p_price = (p_price["bids"][0]["price"] + p_price["asks"][0]["price"]) / 2
+        pool = self._chunk_pool()
+        case = pool.submit(lambda: self.get_case().json())
+        snapshot = pool.submit(MarketSnapshot(self).refresh)
+        case, snapshot = case.result(), snapshot.result()
 
-        # calculate delta
-        _, risk_c = BlackFormula.implied_vol(c_price, etf_price, strike, tte, "C")
-        delta_c = risk_c[0]
-        _, risk_p = BlackFormula.implied_vol(p_price, etf_price, strike, tte, "P")
-        delta_p = risk_p[0]
+        # calculate tte
+        tick = case.get("tick")
+        tte = (300 - tick) / 300 / 12
 
-        # integer quantity for the underlying order
-        delta = round(100 * (delta_c + delta_p) * quantity)
+        # find option tickers
+        etf_price = snapshot.mid("RTM")
+        c_ticker = atm_option_ticker(etf_price, "C")
+        p_ticker = atm_option_ticker(etf_price, "P")
+        strike = int(c_ticker[-2:])
+        straddle_price = snapshot.mid(c_ticker) + snapshot.mid(p_ticker)
 
-        self.place_straddle(
-            quantity=quantity,
-            action=action,
-            order_type=order_type,
-            price=price,
-            etf_price=etf_price,
-            **kwargs,
+        # straddle delta = call delta + put delta
+        _, (delta, _, _) = BlackFormula.implied_vol(
+            straddle_price, etf_price, strike, tte, OptionPayoff.STRADDLE, rfr
         )
-        self.delta_hedge(delta)
 
+        # integer quantity for the underlying order, opposite to the option delta
+        sign = 1 if action == "BUY" else -1
+        if math.isfinite(delta):
+            hedge = round(100 * delta * quantity * sign)
+        else:  # no implied vol, e.g. at expiry or without a quote
+            logger.warning(f"No delta for {c_ticker}/{p_ticker}, hedge skipped")
+            hedge = 0
+        legs = [
+            (c_ticker, quantity, action, call_price),
+            (p_ticker, quantity, action, put_price),
+        ]
+        if hedge != 0:
+            legs.append(
+                ("RTM", abs(hedge), "SELL" if hedge > 0 else "BUY", None, "MARKET")
+            )
+
+        result = self.place_legs(legs, order_type=order_type, **kwargs)
         print("Delta hedge order placed")
-        return True
+        return result
@@ -0,0 +1,168 @@
+import os
+import json
+import mmap
+import time
+import struct
+import threading
+from collections import defaultdict, deque
+from typing import Iterator, NamedTuple, Optional
+
+import requests
+
+from .order import OrderAPI
+
+MAGIC = b"RITREC1\n"
+
+# monotonic ns, tick, status, method, path len, params len, body len
+_HEADER = struct.Struct("<qiHHHII")
+_METHODS = ("get", "post", "delete")
+
+
+class Record(NamedTuple):
+    timestamp_ns: int
+    tick: int  # -1 if the case tick was not known yet
+    status: int
+    method: str
+    path: str
+    params: str  # canonical JSON of the query params
+    body: bytes
+
+
+def _params_key(params: Optional[dict]):
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+
+
+class TrafficRecorder:
+    """
+    Appends every RIT request/response pair to a compact binary log.
+
+    Each record is a fixed-size header followed by the path, the canonical
+    JSON of the query params and the raw response body. The current case tick
+    is taken from the /case responses that pass through the recorder.
+    """
+
+    def __init__(self, path: str, flush: bool = True):
+        """
+        :param path: Log file, created if missing and appended to otherwise.
+        :param flush: Flush after every record so the log survives a crash.
+        """
+        self.path = path
+        self.flush = flush
+        self.tick = -1
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if new:
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+
+    def record(self, method: str, path: str, params: Optional[dict], response):
+        body = response.content or b""
+        if path == "/case" and response.ok:
+            try:
+                tick = json.loads(body).get("tick")
+            except ValueError:
+                tick = None
+            if isinstance(tick, int):
+                self.tick = tick
+        path_b = path.encode()
+        params_b = _params_key(params).encode()
+        header = _HEADER.pack(
+            time.monotonic_ns(),
+            self.tick,
+            response.status_code,
+            _METHODS.index(method.lower()),
+            len(path_b),
+            len(params_b),
+            len(body),
+        )
+        with self._lock:
+            self._file.write(header + path_b + params_b + body)
+            if self.flush:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TrafficLog:
+    """Memory-mapped reader for a TrafficRecorder log."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a RIT traffic log")
+
+    def __iter__(self) -> Iterator[Record]:
+        mm = self._mm
+        pos = len(MAGIC)
+        end = len(mm)
+        while pos + _HEADER.size <= end:
+            ts, tick, status, method, n_path, n_params, n_body = _HEADER.unpack_from(
+                mm, pos
+            )
+            pos += _HEADER.size
+            if pos + n_path + n_params + n_body > end:
+                break  # truncated tail record
+            path = mm[pos : pos + n_path].decode()
+            pos += n_path
+            params = mm[pos : pos + n_params].decode()
+            pos += n_params
+            body = mm[pos : pos + n_body]
+            pos += n_body
+            yield Record(ts, tick, status, _METHODS[method], path, params, body)
+
+    def close(self):
+        self._mm.close()
+
+
+class ReplayClient(OrderAPI):
+    """
+    OrderAPI serving responses from a recorded log instead of the network.
+
+    Responses are matched on (method, path, params) and served in recorded
+    order; once a key's recordings are used up the last one keeps being
+    served, so polling loops keep running at the final recorded state.
+    """
+
+    def __init__(self, log_path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.log = TrafficLog(log_path)
+        self._replies = defaultdict(deque)
+        self._last = {}
+        self.ticks = []
+        for record in self.log:
+            key = (record.method, record.path, record.params)
+            self._replies[key].append(record)
+            if record.path == "/case":
+                self.ticks.append(record.tick)
+
+    def _request_with_timeout(self, method, path, params=None, data=None, timeout=None):
+        key = (method.lower(), path, _params_key(params))
+        queue = self._replies.get(key)
+        if queue:
+            record = queue.popleft()
+            self._last[key] = record
+        else:
+            record = self._last.get(key)
+        if record is None:
+            raise KeyError(f"No recorded response for {method.upper()} {path} {params}")
+
+        response = requests.Response()
+        response.status_code = record.status
+        response._content = record.body
+        response.url = self._url(path)
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    def exhausted(self):
+        """True once every recorded response has been served."""
+        return not any(self._replies.values())
@@ -0,0 +1,165 @@
+import time
+import logging
+import numpy as np
+from typing import Callable, Optional
+
+from .client import RITClient
+
+logger = logging.getLogger(__name__)
+
+
+class TickScheduler:
+    """
+    Drives a strategy off RIT case tick transitions.
+
+    Polls /case slowly while the next tick is far away and quickly inside
+    ``edge_window`` seconds of the expected edge. The expected edge is
+    predicted from the observed tick period, so polling stays at
+    ``idle_interval`` until a first edge has been seen, while the case is
+    not ACTIVE (e.g. PAUSED), and once an expected edge is a whole tick
+    late. Each registered tick callback runs exactly once per tick; a tick
+    that starts while the case is PAUSED runs them when it resumes.
+    Sub-step callbacks run ``n`` times spread evenly through the tick.
+
+    Detection latency is measured as the time between the last poll that
+    still saw the old tick and the poll that saw the new one, which is an
+    upper bound on how late the edge was noticed.
+    """
+
+    FINISHED = ("STOPPED", "ENDED", "FINISHED")
+
+    def __init__(
+        self,
+        client: RITClient,
+        tick_seconds: float = 1.0,
+        fast_interval: float = 0.005,
+        idle_interval: float = 0.1,
+        edge_window: float = 0.05,
+        skip_tick_zero: bool = True,
+    ):
+        """
+        :param client: Client used to poll /case.
+        :param tick_seconds: Initial guess of the wall-clock length of a tick.
+        :param fast_interval: Polling interval (seconds) near the expected edge.
+        :param idle_interval: Longest sleep between polls away from the edge.
+        :param edge_window: How early (seconds) fast polling starts before the edge.
+        :param skip_tick_zero: Do not run callbacks while the case sits at tick 0.
+        """
+        self.client = client
+        self.tick_seconds = tick_seconds
+        self.fast_interval = fast_interval
+        self.idle_interval = idle_interval
+        self.edge_window = edge_window
+        self.skip_tick_zero = skip_tick_zero
+
+        self.tick = None
+        self.case = None
+        self.polls = 0
+        self.edge_latency = []  # seconds, one entry per detected edge
+        self._tick_callbacks = []
+        self._substep_callbacks = []
+        self._last_edge = None
+        self._stopped = False
+
+    def on_tick(self, callback: Callable[[dict], None]):
+        """Registers ``callback(case)``, run once at the start of every tick."""
+        self._tick_callbacks.append(callback)
+        return callback
+
+    def on_substep(self, callback: Callable[[dict, int], None], n: int = 2):
+        """Registers ``callback(case, step)`` for steps 1..n-1 within each tick."""
+        self._substep_callbacks.append((callback, n))
+        return callback
+
+    def stop(self):
+        self._stopped = True
+
+    def _poll(self):
+        self.polls += 1
+        response = self.client.get_case()
+        response.raise_for_status()
+        return response.json()
+
+    def _observe_edge(self, now: float, previous_poll: float):
+        self.edge_latency.append(now - previous_poll)
+        if self._last_edge is not None:
+            # smooth the tick length estimate, ignoring pauses and skipped ticks
+            period = now - self._last_edge
+            if 0 < period < 2 * self.tick_seconds:
+                self.tick_seconds = 0.8 * self.tick_seconds + 0.2 * period
+        self._last_edge = now
+
+    def _next_sleep(self, now: float, substeps, status: Optional[str] = "ACTIVE"):
+        if self._last_edge is None or status != "ACTIVE":
+            return self.idle_interval
+        elapsed = now - self._last_edge
+        to_edge = self.tick_seconds - elapsed
+        if to_edge < -self.tick_seconds:
+            return self.idle_interval  # edge is a whole tick late, stop racing it
+        if to_edge <= self.edge_window:
+            return self.fast_interval
+        wake = to_edge - self.edge_window
+        for _, n, done in substeps:
+            if done < n - 1:
+                wake = min(wake, (done + 1) * self.tick_seconds / n - elapsed)
+        return max(self.fast_interval, min(wake, self.idle_interval))
+
+    def run(self, max_ticks: Optional[int] = None):
+        """
+        Runs until the case finishes, stop() is called, or ``max_ticks`` ticks ran.
+        """
+        self._stopped = False
+        ran = 0
+        previous_poll = time.perf_counter()
+        substeps = []
+        pending = False  # self.tick's callbacks have yet to run
+        while not self._stopped:
+            case = self._poll()
+            now = time.perf_counter()
+            tick = case.get("tick")
+            status = case.get("status")
+
+            if status in self.FINISHED and tick != 0:
+                break
+
+            if tick != self.tick:
+                if self.tick is not None:
+                    self._observe_edge(now, previous_poll)
+                self.tick = tick
+                self.case = case
+                substeps = [[cb, n, 0] for cb, n in self._substep_callbacks]
+                pending = not (tick == 0 and self.skip_tick_zero)
+            elif not pending and self._last_edge is not None and status != "PAUSED":
+                elapsed = now - self._last_edge
+                for step in substeps:
+                    callback, n, done = step
+                    due = int(elapsed * n / self.tick_seconds)
+                    if done < min(due, n - 1):
+                        step[2] = done = min(due, n - 1)
+                        callback(case, done)
+
+            if pending and status != "PAUSED":
+                pending = False
+                self.case = case
+                for callback in self._tick_callbacks:
+                    callback(case)
+                ran += 1
+                if max_ticks is not None and ran >= max_ticks:
+                    break
+
+            previous_poll = time.perf_counter()
+            time.sleep(self._next_sleep(previous_poll, substeps, status))
+
+    def latency_stats(self):
+        """Tick-edge detection latency in milliseconds."""
+        if not self.edge_latency:
+            return {"edges": 0}
+        lat = np.asarray(self.edge_latency) * 1e3
+        return {
+            "edges": len(lat),
+            "mean_ms": lat.mean(),
+            "p50_ms": np.percentile(lat, 50),
+            "p99_ms": np.percentile(lat, 99),
+            "max_ms": lat.max(),
+            "polls": self.polls,
+        }
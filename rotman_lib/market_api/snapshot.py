@@ -0,0 +1,84 @@
+from typing import Iterable, Optional
+
+from .client import RITClient
+from .models import parse_securities
+
+
+class MarketSnapshot:
+    """
+    Tick-scoped view of every security, built from one bulk /securities call.
+
+    Securities are kept as slotted Security models indexed by ticker, so bid,
+    ask, mid, vwap and position are dict lookups. The snapshot is only refreshed when asked to,
+    either explicitly through refresh() or through ensure(tick) when the case
+    tick has moved on.
+    """
+
+    def __init__(self, client: RITClient, tick: Optional[int] = None):
+        """
+        :param client: Client used for the bulk /securities request.
+        :param tick: (Optional) Case tick; if given the snapshot is loaded immediately.
+        """
+        self.client = client
+        self.tick = None
+        self.securities_ = {}
+        if tick is not None:
+            self.refresh(tick)
+
+    def refresh(self, tick: Optional[int] = None):
+        """
+        Reloads every security with a single unfiltered get_securities() call.
+
+        :param tick: (Optional) Case tick the new data belongs to.
+        """
+        response = self.client.get_securities()
+        response.raise_for_status()
+        self.securities_ = parse_securities(response)
+        self.tick = tick
+        return self
+
+    def ensure(self, tick: int):
+        """Refreshes only if the snapshot was not taken at ``tick``."""
+        if self.tick != tick or not self.securities_:
+            self.refresh(tick)
+        return self
+
+    ### lookups
+
+    def __contains__(self, ticker: str):
+        return ticker in self.securities_
+
+    def __getitem__(self, ticker: str):
+        return self.securities_[ticker]
+
+    def __len__(self):
+        return len(self.securities_)
+
+    @property
+    def tickers(self):
+        return list(self.securities_.keys())
+
+    def bid(self, ticker: str):
+        return self.securities_[ticker].bid
+
+    def ask(self, ticker: str):
+        return self.securities_[ticker].ask
+
+    def mid(self, ticker: str):
+        return self.securities_[ticker].mid
+
+    def last(self, ticker: str):
+        return self.securities_[ticker].last
+
+    def vwap(self, ticker: str):
+        return self.securities_[ticker].vwap
+
+    def position(self, ticker: str):
+        sec = self.securities_.get(ticker)
+        return 0 if sec is None else sec.position or 0
+
+    def positions(self, tickers: Optional[Iterable[str]] = None):
+        """Net position per ticker (all securities if ``tickers`` is None)."""
+        if tickers is None:
+            tickers = self.securities_.keys()
+        return {t: self.position(t) for t in tickers}
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from .client import RITClient
+from .models import TAS_DTYPE, parse_tas
+
+
+class _Tape:
+    """
+    Fixed-size state for one ticker: a ring buffer of the latest prints plus
+    per-tick aggregates for the last ``window`` ticks, indexed by tick % window.
+    """
+
+    def __init__(self, capacity: int, window: int):
+        self.cursor = None
+        self.prints = np.zeros(capacity, dtype=TAS_DTYPE)
+        self.head = 0  # next write position
+        self.count = 0  # number of valid prints (<= capacity)
+        self.last_tick = -1
+
+        self.slot_tick = np.full(window, -1, dtype=np.int64)
+        self.slot_pq = np.zeros(window)
+        self.slot_q = np.zeros(window)
+        self.slot_n = np.zeros(window, dtype=np.int64)
+
+    def append(self, batch: np.ndarray):
+        n = len(batch)
+        capacity = len(self.prints)
+        if n >= capacity:
+            batch = batch[-capacity:]
+            n = capacity
+        end = self.head + n
+        if end <= capacity:
+            self.prints[self.head : end] = batch
+        else:
+            split = capacity - self.head
+            self.prints[self.head :] = batch[:split]
+            self.prints[: n - split] = batch[split:]
+        self.head = end % capacity
+        self.count = min(self.count + n, capacity)
+
+    def aggregate(self, ticks: np.ndarray, pq: np.ndarray, q: np.ndarray):
+        window = len(self.slot_tick)
+        for t in np.unique(ticks):
+            mask = ticks == t
+            slot = t % window
+            if self.slot_tick[slot] != t:
+                self.slot_tick[slot] = t
+                self.slot_pq[slot] = 0.0
+                self.slot_q[slot] = 0.0
+                self.slot_n[slot] = 0
+            self.slot_pq[slot] += pq[mask].sum()
+            self.slot_q[slot] += q[mask].sum()
+            self.slot_n[slot] += mask.sum()
+        self.last_tick = max(self.last_tick, int(ticks.max()))
+
+    def ordered(self):
+        if self.count < len(self.prints):
+            return self.prints[: self.count].copy()
+        return np.concatenate([self.prints[self.head :], self.prints[: self.head]])
+
+
+class TimeAndSalesEngine:
+    """
+    Streaming time & sales reader for a set of tickers.
+
+    Every poll() fetches the prints after each ticker's cursor concurrently,
+    appends them to a preallocated NumPy ring buffer and updates per-tick
+    price*quantity, quantity and trade-count aggregates. VWAP, volume and
+    trade count are available for a single tick or for a rolling window of
+    ticks. Memory is fixed by ``capacity`` and ``window`` regardless of how
+    long the case runs.
+    """
+
+    def __init__(
+        self,
+        client: RITClient,
+        tickers: Iterable[str],
+        capacity: int = 4096,
+        window: int = 75,
+        limit: Optional[int] = 500,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        :param client: Client used for the /securities/tas requests.
+        :param tickers: Tickers to follow.
+        :param capacity: Number of prints kept per ticker.
+        :param window: Number of ticks covered by the rolling aggregates.
+        :param limit: (Optional) Maximum number of prints fetched per request.
+        :param max_workers: (Optional) Thread pool size, defaults to one per ticker.
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        self.client = client
+        self.tickers = list(tickers)
+        self.window = window
+        self.limit = limit
+        self.tapes = {t: _Tape(capacity, window) for t in self.tickers}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.tickers))
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fetch(self, ticker: str):
+        tape = self.tapes[ticker]
+        response = self.client.get_securities_tas(
+            ticker, after=tape.cursor, limit=self.limit
+        )
+        response.raise_for_status()
+        return parse_tas(response)
+
+    def _ingest(self, ticker: str, batch: np.ndarray):
+        if len(batch) == 0:
+            return 0
+        tape = self.tapes[ticker]
+        batch.sort(order="id")
+        if tape.cursor is not None:
+            batch = batch[batch["id"] > tape.cursor]
+        if len(batch) == 0:
+            return 0
+        tape.cursor = int(batch["id"][-1])
+
+        valid = (
+            (batch["tick"] >= 0) & (batch["quantity"] > 0) & np.isfinite(batch["price"])
+        )
+        batch = batch[valid]
+        if len(batch) == 0:
+            return 0
+        tape.append(batch)
+        tape.aggregate(
+            batch["tick"].astype(np.int64),
+            batch["price"] * batch["quantity"],
+            batch["quantity"],
+        )
+        return len(batch)
+
+    def poll(self):
+        """
+        Fetches new prints for every ticker concurrently.
+
+        :return: Dict of ticker -> number of prints ingested.
+        """
+        results = self._executor.map(self._fetch, self.tickers)
+        return {t: self._ingest(t, batch) for t, batch in zip(self.tickers, results)}
+
+    ### per tick
+
+    def _slot(self, ticker: str, tick: Optional[int]):
+        tape = self.tapes[ticker]
+        if tick is None:
+            tick = tape.last_tick
+        slot = tick % self.window
+        if tick < 0 or tape.slot_tick[slot] != tick:
+            return tape, None
+        return tape, slot
+
+    def vwap(self, ticker: str, tick: Optional[int] = None):
+        """VWAP of ``tick`` (latest tick with prints if None)."""
+        tape, slot = self._slot(ticker, tick)
+        if slot is None or tape.slot_q[slot] == 0:
+            return np.nan
+        return tape.slot_pq[slot] / tape.slot_q[slot]
+
+    def volume(self, ticker: str, tick: Optional[int] = None):
+        tape, slot = self._slot(ticker, tick)
+        return 0.0 if slot is None else tape.slot_q[slot]
+
+    def trade_count(self, ticker: str, tick: Optional[int] = None):
+        tape, slot = self._slot(ticker, tick)
+        return 0 if slot is None else int(tape.slot_n[slot])
+
+    ### rolling window
+
+    def _window_mask(self, tape: _Tape, tick: Optional[int]):
+        if tick is None:
+            tick = tape.last_tick
+        return (tape.slot_tick > tick - self.window) & (tape.slot_tick <= tick)
+
+    def window_vwap(self, ticker: str, tick: Optional[int] = None):
+        """VWAP over the ``window`` ticks ending at ``tick``."""
+        tape = self.tapes[ticker]
+        mask = self._window_mask(tape, tick)
+        q = tape.slot_q[mask].sum()
+        return tape.slot_pq[mask].sum() / q if q > 0 else np.nan
+
+    def window_volume(self, ticker: str, tick: Optional[int] = None):
+        tape = self.tapes[ticker]
+        return tape.slot_q[self._window_mask(tape, tick)].sum()
+
+    def window_trade_count(self, ticker: str, tick: Optional[int] = None):
+        tape = self.tapes[ticker]
+        return int(tape.slot_n[self._window_mask(tape, tick)].sum())
+
+    ### views
+
+    def prints(self, ticker: str):
+        """Buffered prints for ``ticker`` as a structured array, oldest first."""
+        return self.tapes[ticker].ordered()
+
+    def to_frame(self):
+        rows = []
+        for t in self.tickers:
+            last_tick = self.tapes[t].last_tick
+            rows.append(
+                [
+                    last_tick if last_tick >= 0 else np.nan,
+                    self.vwap(t),
+                    self.volume(t),
+                    self.trade_count(t),
+                    self.window_vwap(t),
+                    self.window_volume(t),
+                ]
+            )
+        return pd.DataFrame(
+            rows,
+            index=self.tickers,
+            columns=[
+                "latest_tick",
+                "vwap",
+                "vol",
+                "trades",
+                "window_vwap",
+                "window_vol",
+            ],
+        )
@@ -1,15 +1,22 @@
-import re
+import math
 from collections import defaultdict
 
 from rotman_lib import *
+from rotman_lib.market_api.order import atm_option_ticker
 client = OrderAPI(api_key="")
+profiler = default_profiler  # disabled unless enabled below or by a harness
+snapshot = MarketSnapshot(client)
+news_feed = NewsFeed(client)
+iv_service = IVService()  # per-tick cache, warm-started across ticks
+risk = PortfolioRisk()  # net Greeks of the book, updated from the client's fills
+client.ledger.on_fill(risk.apply)
 
 news = []
 rv = []
 ticker = "RTM"
 spread = 0.02
 
-rfr, rv_t, delta_limit, pattern_delta = None, None, None, None
+rfr, rv_t, delta_limit, penalty_pct = None, None, None, None
 
 state = {
     "cash": 0.0,
@@ -28,6 +35,19 @@ max_n_etf = 50000
 mult = 100  # shares per option contract
 n = int(max_n_option / 2)  # number of straddles
 
+
+def bind(api_client):
+    """Points the strategy at another client, e.g. a mock server or a replay."""
+    global client, snapshot, news_feed
+    client.ledger.off_fill(risk.apply)  # the old client's fills no longer count
+    client = api_client
+    snapshot = MarketSnapshot(client)
+    news_feed = NewsFeed(client)
+    iv_service.clear()  # cached solves and warm starts belong to the old market
+    risk.reset(client.ledger.positions)
+    client.ledger.on_fill(risk.apply)
+
+
 # fetch news
 def fetch_and_save_news(client):
 
@@ -74,366 +94,316 @@ def place_order(
     if qty <= 0:
         return None
     print(f"Placing order: {ticker} {order_type} {qty} {action}")
-    def _post_one(q):
-        resp = client.post_order(ticker, order_type, int(q), action)
-        if not resp.ok:
-            # print body so you can see the real reason (even if status=500)
-            print("ORDER FAILED:", ticker, order_type, q, action)
-            print("status:", resp.status_code)
-            print("url:", getattr(resp, "url", ""))
-            print("text:", resp.text)
-            try:
-                print("json:", resp.json())
-            except Exception:
-                pass
-            resp.raise_for_status()
-        return resp.json()
-
-    if ticker == "RTM" and qty > max_chunk_rtm:
-        results = []
-        remaining = qty
-        while remaining > 0:
-            chunk = min(max_chunk_rtm, remaining)
-            results.append(_post_one(chunk))
-            remaining -= chunk
-        return results
-    if ticker.startswith("RTM1") and qty > max_chunk_option:
-        results = []
-        remaining = qty
-        while remaining > 0:
-            chunk = min(max_chunk_option, remaining)
-            results.append(_post_one(chunk))
-            remaining -= chunk
-        return results
-
-    # Normal single order
-    return _post_one(qty)
+    max_chunk = max_chunk_option if ticker.startswith("RTM1") else max_chunk_rtm
+    # chunks are sent concurrently; 429 responses are retried after the server's wait hint
+    routed = client.route_order(ticker, order_type, qty, action, max_chunk=max_chunk)
+    if not routed.ok:
+        # print the real reason (even if status=500)
+        print("ORDER FAILED:", ticker, order_type, qty, action)
+        for e in routed.errors:
+            print(e, getattr(getattr(e, "response", None), "text", ""))
+        raise routed.errors[0]
+    return routed
+
+
+def leg_fill(routed):
+    """(vwap, filled quantity) of an order; (0.0, 0) if nothing filled."""
+    if routed is None or not routed.filled_quantity:
+        return 0.0, 0
+    return routed.vwap, routed.filled_quantity
+
+
+def place_straddle_legs(c_ticker, p_ticker, quantity, action):
+    # both legs go out together; a rejected leg makes the other one unwind
+    print(f"Placing straddle: {c_ticker}/{p_ticker} MARKET {quantity} {action}")
+    legs = client.place_legs(
+        [(c_ticker, quantity, action), (p_ticker, quantity, action)]
+    )
+    if legs.rejected:
+        print("STRADDLE FAILED:", legs.rejected, "unwound:", legs.unwound)
+        raise RuntimeError(f"straddle legs rejected: {legs.rejected}")
+    return legs[0], legs[1]
+
+
+def on_tick(case):
+    """Runs the straddle strategy once for the tick described by ``case``."""
+    with profiler.tick(case.get("tick")):
+        _on_tick(case)
+
+
+def _on_tick(case):
+    global rfr, rv_t, delta_limit, penalty_pct
+
+    tick = case.get("tick")
+
+    profiler.lap("fetch")
+    # only the items published since the last poll are fetched and parsed
+    for event in news_feed.poll():
+        print(event)
+    rfr = news_feed.rfr if news_feed.rfr is not None else 0.0
+    rv_t = news_feed.rv
+    delta_limit = news_feed.delta_limit
+    penalty_pct = news_feed.penalty_pct
+    if rv_t is None:
+        return  # realized volatility not announced yet
+
+    rv.append(rv_t)
+
+    # strategy
+    tte = (300 - tick) / 300 / 12
+    if tte <= 0:
+        return  # options expire at the last tick, nothing left to price
+    snapshot.refresh(tick)  # one bulk /securities call for the tick
+    underlying_price = snapshot.mid(ticker)  # mid_price
+    # nearest listed strike; RTM can trade outside the 45-54 chain
+    c_atm_ticker = atm_option_ticker(underlying_price, "C")
+    p_atm_ticker = atm_option_ticker(underlying_price, "P")
+    atm_strike = int(c_atm_ticker[len("RTM1C") :])
+
+    c_atm_price = snapshot.mid(c_atm_ticker)  # mid_price
+    p_atm_price = snapshot.mid(p_atm_ticker)  # mid_price
+
+    atm_premium = (
+        (c_atm_price + p_atm_price) * mult * n
+    )  # total premium for n straddles
+
+    profiler.lap("analytics")  # order placement below is charged to "order"
+    iv_atm, (delta_atm, vega_atm, gamma_atm) = iv_service.solve(
+        f"RTM1S{int(atm_strike):02d}",
+        (c_atm_price + p_atm_price),
+        underlying_price,
+        atm_strike,
+        tte,
+        OptionPayoff.STRADDLE,
+        rfr,
+    )
+    have_options = any(k != "RTM" for k in state["position"].keys())
 
+    # if position is empty, open new position based on signal
+    if not have_options:
+        gap = (
+            2 * option_commission(n) * 240 / (underlying_price**2 * gamma_atm * 100 * n)
+        )
+        signal = atm_straddle_transaction(rv[-1], iv_atm, gap)
+        state["side"] = signal
 
-if __name__ == "__main__":
-    while True:
+        state["strike"] = atm_strike
 
-        case = client.get_case().json()
-        tick = case.get("tick")
-        status = case.get("status")
+        if signal == "SELL":
+            # post SELL orders
+            print(c_atm_ticker, "MARKET", n, "SELL")
+            resp_c, resp_p = place_straddle_legs(c_atm_ticker, p_atm_ticker, n, "SELL")
+            c_atm_price, c_atm_qty = leg_fill(resp_c)
+            p_atm_price, p_atm_qty = leg_fill(resp_p)
 
-        if tick == 0:
-            continue
-        if status in ("STOPPED", "ENDED", "FINISHED") and tick != 0:
-            break
+            if resp_c.status != "TRANSACTED":
+                print(
+                    f"Order for {c_atm_ticker} not fully filled. Status: {resp_c.status}"
+                )
 
-        response = client.get_news()
-        news = response.json()
-        news_map = {item["news_id"]: item for item in news}
-
-        # extract the risk free rate and realized volatility from the news
-        if tick == 1 or rfr is None:
-            rfr_news = news_map[1]["body"]
-            pattern = r"risk free rate is (\d+(?:\.\d+)?)%.*?realized volatility is (\d+(?:\.\d+)?)%"
-            match = re.search(pattern, rfr_news)
-            if match:
-                rfr = float(match.group(1)) / 100
-                rv_t = float(match.group(2)) / 100
-                print("rfr:", rfr)
-                print("rv:", rv_t)
-            else:
-                print("No match found.")
-                # rfr = float(input("Input risk free rate (%): ")) / 100
-                rfr = 0.0
-                rv_t = float(input("Input realized volatility (%): ")) / 100
-
-            delta_news = news_map[2]["body"]
-            pattern_delta = r"delta limit.*?(\d+).*?penalty percentage is (\d+)%"
-            match = re.search(pattern_delta, delta_news, re.IGNORECASE | re.DOTALL)
-            if match:
-                delta_limit = int(match.group(1))
-                penalty_pct = float(match.group(2))
-                print(delta_limit, penalty_pct)
-            else:
-                print("No match found for delta limit.")
-                delta_limit = float(input("Input delta limit: "))
-                penalty_pct = float(input("Input penalty percentage (%): "))
-        elif tick == 74 or tick == 149 or tick == 224:
-            rv_news = news_map[(tick + 1) // 75 * 2 + 1]["body"]
-            match = re.search(r"(\d+(?:\.\d+)?)%", rv_news)
-            if match:
-                rv_t = float(match.group(1)) / 100
-                print("Update rv:", rv_t)
-            else:
-                print("No match found for rv update.")
-                rv_t = float(input("Input realized volatility (%): ")) / 100
+            state["position"][c_atm_ticker] -= c_atm_qty
+            state["position"][p_atm_ticker] -= p_atm_qty
+            state["strike"] = atm_strike
 
-        rv.append(rv_t)
+            state["cash"] += (
+                c_atm_price * c_atm_qty * mult
+                + p_atm_price * p_atm_qty * mult
+                - option_commission(c_atm_qty)
+            )
 
-        # strategy
-        tte = (300 - tick) / 300 / 12
-        etf_info = client.get_securities(ticker).json()[0]
-        underlying_price = (etf_info["bid"] + etf_info["ask"]) / 2  # mid_price
-        atm_strike = round(underlying_price)
+        elif signal == "BUY":
+            print(c_atm_ticker, "MARKET", n, "BUY")
+            resp_c, resp_p = place_straddle_legs(c_atm_ticker, p_atm_ticker, n, "BUY")
+            c_atm_price, c_atm_qty = leg_fill(resp_c)
+            p_atm_price, p_atm_qty = leg_fill(resp_p)
 
-        c_atm_ticker = f"RTM1C{int(atm_strike):02d}"
-        p_atm_ticker = f"RTM1P{int(atm_strike):02d}"
+            if resp_c.status != "TRANSACTED":
+                print(
+                    f"Order for {c_atm_ticker} not fully filled. Status: {resp_c.status}"
+                )
 
-        c_atm_info = client.get_securities(c_atm_ticker).json()[0]
-        c_atm_price = (c_atm_info["bid"] + c_atm_info["ask"]) / 2  # mid_price
+            state["position"][c_atm_ticker] += c_atm_qty
+            state["position"][p_atm_ticker] += p_atm_qty
+            state["strike"] = atm_strike
 
-        p_atm_info = client.get_securities(p_atm_ticker).json()[0]
-        p_atm_price = (p_atm_info["bid"] + p_atm_info["ask"]) / 2  # mid_price
+            state["cash"] -= (
+                c_atm_price * c_atm_qty * mult
+                + p_atm_price * p_atm_qty * mult
+                + option_commission(c_atm_qty)
+            )
+
+        else:
+            pass  # no signal, keep empty position
+
+    # If have options, check flip and check etf limits
+    else:
+        # get current option and underlying price
+        strike = state["strike"]
 
-        atm_premium = (
-            (c_atm_price + p_atm_price) * mult * n
-        )  # total premium for n straddles
+        c_ticker = f"RTM1C{int(strike):02d}"
+        p_ticker = f"RTM1P{int(strike):02d}"
 
-        iv_atm, (delta_atm, vega_atm, gamma_atm) = BlackFormula.implied_vol(
-            (c_atm_price + p_atm_price),
+        c_price = snapshot.mid(c_ticker)
+        p_price = snapshot.mid(p_ticker)
+
+        # calculate current option price and tick
+        iv, (delta, vega, gamma) = iv_service.solve(
+            f"RTM1S{int(strike):02d}",
+            (c_price + p_price),
             underlying_price,
-            atm_strike,
+            strike,
             tte,
             OptionPayoff.STRADDLE,
             rfr,
         )
-        have_options = any(k != "RTM" for k in state["position"].keys())
+        # calculate new signal
+        gap = 2 * option_commission(n) * 240 / (underlying_price**2 * gamma * 100 * n)
 
-        # if position is empty, open new position based on signal
-        if not have_options:
-            gap = (
-                2 * option_commission(n) * 240 / (underlying_price**2 * gamma_atm * 100 * n)
-            )
-            signal = atm_straddle_transaction(rv[-1], iv_atm, gap)
-            state["side"] = signal
+        signal = atm_straddle_gap_signal(rv[-1], iv, gap)
 
-            state["strike"] = atm_strike
+        if signal is None:
+            signal = state["side"]  # if no signal, keep current position
+
+        ## signal changed, need to flip position
+        if signal != state["side"]:
+
+            # 1) close existing position
+            existing_n = abs(state["position"][c_ticker])
+            # premium = (
+            #     (c_price + p_price) * mult * existing_n
+            # )  # current straddle premium
+
+            if state["side"] == "SELL":  # short -> buy to close
+
+                resp_c, resp_p = place_straddle_legs(c_ticker, p_ticker, n, "BUY")
+                c_price, c_qty = leg_fill(resp_c)
+                p_price, p_qty = leg_fill(resp_p)
+
+                buy_cost = c_price * c_qty * mult + p_price * p_qty * mult
+                state["cash"] -= buy_cost + option_commission(p_qty)
+
+            else:  # long -> sell to close
+
+                resp_c, resp_p = place_straddle_legs(
+                    c_ticker, p_ticker, existing_n, "SELL"
+                )
+                c_price, c_qty = leg_fill(resp_c)
+                p_price, p_qty = leg_fill(resp_p)
 
+                sell_cost = c_price * c_qty * mult + p_price * p_qty * mult
+                state["cash"] += sell_cost - option_commission(p_qty)
+
+            # state["cash"] -= option_commission(c_qty)
+            state["position"].pop(c_ticker, None)
+            state["position"].pop(p_ticker, None)
+            state["strike"] = None
+            state["side"] = None
+
+            # 2) open new positions, check new atm option position limit
+
+            # if under etf position limit
+            if abs(delta_atm * mult * n) <= max_n_etf:
+                trade_n = n
+            # over limit of etf, buy/sell less options
+            else:
+                option_delta_keeps = max_n_etf  # if target_rtm > 0 else -max_n_etf
+                trade_n = option_delta_keeps / (delta_atm * mult)
+                atm_premium = (
+                    atm_premium / n * trade_n
+                )  # adjust premium for smaller position
+
+            # open new atm straddle position
             if signal == "SELL":
-                # post SELL orders
-                print(c_atm_ticker, "MARKET", n, "SELL")
-                resp_c = place_order(c_atm_ticker, "MARKET", n, "SELL")
-                c_atm_price = client.get_securities(c_atm_ticker).json()[0]["vwap"]
-                c_atm_qty = client.get_securities(c_atm_ticker).json()[0]["position"]
-
-                if status != "TRANSACTED":
-                    print(f"Order for {c_atm_ticker} not fully filled. Status: {status}")
-
-                resp_p = place_order(p_atm_ticker, "MARKET", n, "SELL")
-                p_atm_price = client.get_securities(p_atm_ticker).json()[0]["vwap"]
-                p_atm_qty = client.get_securities(p_atm_ticker).json()[0]["position"]
-                # status = resp_p["status"]  # TRANSACTED
-
-                state["position"][c_atm_ticker] -= c_atm_qty
-                state["position"][p_atm_ticker] -= p_atm_qty
+                state["position"][c_atm_ticker] -= trade_n
+                state["position"][p_atm_ticker] -= trade_n
                 state["strike"] = atm_strike
+                state["side"] = signal
+                # state["cash"] += atm_premium - option_commission(trade_n)
+
+                resp_c, resp_p = place_straddle_legs(
+                    c_atm_ticker, p_atm_ticker, trade_n, "SELL"
+                )
+                c_atm_price, c_atm_qty = leg_fill(resp_c)
+                p_atm_price, p_atm_qty = leg_fill(resp_p)
 
                 state["cash"] += (
                     c_atm_price * c_atm_qty * mult
                     + p_atm_price * p_atm_qty * mult
                     - option_commission(c_atm_qty)
                 )
-
-            elif signal == "BUY":
-                print(c_atm_ticker, "MARKET", n, "BUY")
-                resp_c = place_order(c_atm_ticker, "MARKET", n, "BUY")
-                c_atm_price = client.get_securities(c_atm_ticker).json()[0]["vwap"]
-                c_atm_qty = client.get_securities(c_atm_ticker).json()[0]["position"]
-
-                if status != "TRANSACTED":
-                    print(f"Order for {c_atm_ticker} not fully filled. Status: {status}")
-
-                resp_p = place_order(p_atm_ticker, "MARKET", n, "BUY")
-                p_atm_price = client.get_securities(p_atm_ticker).json()[0]["vwap"]
-                p_atm_qty = client.get_securities(p_atm_ticker).json()[0]["position"]
-                # status = resp_p["status"]  # TRANSACTED
-
-                state["position"][c_atm_ticker] += c_atm_qty
-                state["position"][p_atm_ticker] += p_atm_qty
+            else:
+                state["position"][c_atm_ticker] += trade_n
+                state["position"][p_atm_ticker] += trade_n
                 state["strike"] = atm_strike
+                state["side"] = signal
+
+                resp_c, resp_p = place_straddle_legs(
+                    c_atm_ticker, p_atm_ticker, trade_n, "BUY"
+                )
+                c_atm_price, c_atm_qty = leg_fill(resp_c)
+                p_atm_price, p_atm_qty = leg_fill(resp_p)
 
                 state["cash"] -= (
                     c_atm_price * c_atm_qty * mult
                     + p_atm_price * p_atm_qty * mult
                     + option_commission(c_atm_qty)
                 )
-
-            else:
-                pass  # no signal, keep empty position
-
-        # If have options, check flip and check etf limits
         else:
-            # get current option and underlying price
-            tickers = state["position"].keys()
-            strike = state["strike"]
-
-            c_ticker = f"RTM1C{int(strike):02d}"
-            p_ticker = f"RTM1P{int(strike):02d}"
-
-            c_price_info = client.get_securities(c_ticker).json()[0]
-            c_price = (c_price_info["bid"] + c_price_info["ask"]) / 2
-
-            p_price_info = client.get_securities(p_ticker).json()[0]
-            p_price = (p_price_info["bid"] + p_price_info["ask"]) / 2
-
-            # calculate current option price and tick
-            iv, (delta, vega, gamma) = BlackFormula.implied_vol(
-                (c_price + p_price),
+            pass  # signal not changed, keep position
+
+    # update option indicators
+    have_options = any(k != "RTM" for k in state["position"].keys())
+
+    # Delta Hedge every tick
+    profiler.lap("hedge")
+    if have_options:
+
+        # every held strike is revalued, a flip can leave more than one
+        vols = {}
+        for strike in risk.held_strikes():
+            c_ticker = f"RTM1C{strike:02d}"
+            p_ticker = f"RTM1P{strike:02d}"
+            iv, _ = iv_service.solve(
+                f"RTM1S{strike:02d}",
+                snapshot.mid(c_ticker) + snapshot.mid(p_ticker),
                 underlying_price,
                 strike,
                 tte,
                 OptionPayoff.STRADDLE,
                 rfr,
             )
-            # calculate new signal
-            gap = 2 * option_commission(n) * 240 / (underlying_price**2 * gamma * 100 * n)
-
-            signal = atm_straddle_gap_signal(rv[-1], iv, gap)
-
-            if signal is None:
-                signal = state["side"]  # if no signal, keep current position
-
-            ## signal changed, need to flip position
-            if signal != state["side"]:
-
-                # 1) close existing position
-                existing_n = abs(state["position"][c_ticker])
-                # premium = (
-                #     (c_price + p_price) * mult * existing_n
-                # )  # current straddle premium
-
-                if state["side"] == "SELL":  # short -> buy to close
-
-                    resp_c = place_order(c_ticker, "MARKET", n, "BUY")
-                    c_price = client.get_securities(c_ticker).json()[0]["vwap"]
-                    c_qty = client.get_securities(c_ticker).json()[0]["position"]
-                    # status = resp_c["status"]  # TRANSACTED
-
-                    resp_p = place_order(p_ticker, "MARKET", n, "BUY")
-                    p_price = client.get_securities(p_ticker).json()[0]["vwap"]
-                    p_qty = client.get_securities(p_ticker).json()[0]["position"]
-                    # status = resp_p["status"]  # TRANSACTED
-
-                    buy_cost = c_price * c_qty * mult + p_price * p_qty * mult
-                    state["cash"] -= buy_cost + option_commission(p_qty)
-
-                else:  # long -> sell to close
-
-                    resp_c = place_order(c_ticker, "MARKET", existing_n, "SELL")
-                    c_price = client.get_securities(c_ticker).json()[0]["vwap"]
-                    c_qty = client.get_securities(c_ticker).json()[0]["position"]
-                    # status = resp_c["status"]  # TRANSACTED
-
-                    resp_p = place_order(p_ticker, "MARKET", existing_n, "SELL")
-                    p_price = client.get_securities(p_ticker).json()[0]["vwap"]
-                    p_qty = client.get_securities(p_ticker).json()[0]["position"]
-                    # status = resp_p["status"]  # TRANSACTED
-
-                    sell_cost = c_price * c_qty * mult + p_price * p_qty * mult
-                    state["cash"] += sell_cost - option_commission(p_qty)
-
-                # state["cash"] -= option_commission(c_qty)
-                state["position"].pop(c_ticker, None)
-                state["position"].pop(p_ticker, None)
-                state["strike"] = None
-                state["side"] = None
-
-                # 2) open new positions, check new atm option position limit
-
-                # if under etf position limit
-                if abs(delta_atm * mult * n) <= max_n_etf:
-                    trade_n = n
-                # over limit of etf, buy/sell less options
-                else:
-                    option_delta_keeps = max_n_etf  # if target_rtm > 0 else -max_n_etf
-                    trade_n = option_delta_keeps / (delta_atm * mult)
-                    atm_premium = (
-                        atm_premium / n * trade_n
-                    )  # adjust premium for smaller position
-
-                # open new atm straddle position
-                if signal == "SELL":
-                    state["position"][c_atm_ticker] -= trade_n
-                    state["position"][p_atm_ticker] -= trade_n
-                    state["strike"] = atm_strike
-                    state["side"] = signal
-                    # state["cash"] += atm_premium - option_commission(trade_n)
-
-                    resp_c = place_order(c_atm_ticker, "MARKET", trade_n, "SELL")
-                    c_atm_price = client.get_securities(c_atm_ticker).json()[0]["vwap"]
-                    c_atm_qty = client.get_securities(c_atm_ticker).json()[0]["position"]
-                    # status = resp_c["status"]  # TRANSACTED
-
-                    resp_p = place_order(p_atm_ticker, "MARKET", trade_n, "SELL")
-                    p_atm_price = client.get_securities(p_atm_ticker).json()[0]["vwap"]
-                    p_atm_qty = client.get_securities(p_atm_ticker).json()[0]["position"]
-                    # status = resp_p["status"]  # TRANSACTED
-                    state["cash"] += (
-                        c_atm_price * c_atm_qty * mult
-                        + p_atm_price * p_atm_qty * mult
-                        - option_commission(c_atm_qty)
-                    )
-                else:
-                    state["position"][c_atm_ticker] += trade_n
-                    state["position"][p_atm_ticker] += trade_n
-                    state["strike"] = atm_strike
-                    state["side"] = signal
-
-                    resp_c = place_order(c_atm_ticker, "MARKET", trade_n, "BUY")
-                    c_atm_price = client.get_securities(c_atm_ticker).json()[0]["vwap"]
-                    c_atm_qty = client.get_securities(c_atm_ticker).json()[0]["position"]
-                    # status = resp_c["status"]  # TRANSACTED
-
-                    resp_p = place_order(p_atm_ticker, "MARKET", trade_n, "BUY")
-                    p_atm_price = client.get_securities(p_atm_ticker).json()[0]["vwap"]
-                    p_atm_qty = client.get_securities(p_atm_ticker).json()[0]["position"]
-                    # status = resp_p["status"]  # TRANSACTED
-                    state["cash"] -= (
-                        c_atm_price * c_atm_qty * mult
-                        + p_atm_price * p_atm_qty * mult
-                        + option_commission(c_atm_qty)
-                    )
-            else:
-                pass  # signal not changed, keep position
+            vols[c_ticker] = vols[p_ticker] = iv
+        risk.delta_limit = delta_limit
+        risk.update_market(underlying_price, tte, rfr, vols)
+        if not math.isfinite(risk.net_delta):
+            print("No implied vol for the held options, hedge skipped")
+            return
 
-        # update option indicators
-        have_options = any(k != "RTM" for k in state["position"].keys())
+        diff_rtm = risk.hedge_shares()  # RTM order that flattens net delta
 
-        # Delta Hedge every tick
-        if have_options:
+        if diff_rtm != 0:
+            if abs(diff_rtm) > max_n_etf:
+                diff_rtm = max_n_etf if diff_rtm > 0 else -max_n_etf
+            qty = abs(diff_rtm)
+            side = "BUY" if diff_rtm > 0 else "SELL"
 
-            opt_pos = 1 if state["side"] == "BUY" else -1  # contracts (same as put)
-            c_ticker = f"RTM1C{int(state['strike']):02d}"
-            p_ticker = f"RTM1P{int(state['strike']):02d}"
+            resp = place_order("RTM", "MARKET", qty, side)
+            # exe = resp[0]['vwap']
 
-            c_price_info = client.get_securities(c_ticker).json()[0]
-            c_price = (c_price_info["bid"] + c_price_info["ask"]) / 2
-            p_price_info = client.get_securities(p_ticker).json()[0]
-            p_price = (p_price_info["bid"] + p_price_info["ask"]) / 2
-            mkt_straddle = c_price + p_price
+            # cash_change = -qty * exe if side == "BUY" else +qty * exe
+            # state["cash"] += cash_change - stock_commission(qty)
 
-            iv, (delta, vega, gamma) = BlackFormula.implied_vol(
-                mkt_straddle,
-                underlying_price,
-                state["strike"],
-                tte,
-                OptionPayoff.STRADDLE,
-                rfr,
-            )
-
-            pos_contracts = state["position"].get(c_ticker, 0)
-            option_delta_shares = opt_pos * delta * mult * pos_contracts
+        # the ledger holds the shares actually filled, not the quantity asked for
+        state["position"]["RTM"] = client.ledger.position("RTM")
+        if state["position"]["RTM"] == 0:
+            state["position"].pop("RTM", None)
 
-            current_rtm = state["position"].get("RTM", 0)
-            target_rtm = int(round(-option_delta_shares))  # hedging amount
-            diff_rtm = target_rtm - current_rtm
 
-            if diff_rtm != 0:
-                if abs(diff_rtm) > max_n_etf:
-                    diff_rtm = max_n_etf if diff_rtm > 0 else -max_n_etf
-                qty = abs(diff_rtm)
-                side = "BUY" if diff_rtm > 0 else "SELL"
-
-                resp = place_order("RTM", "MARKET", qty, side)
-                # exe = resp[0]['vwap']
-
-                # cash_change = -qty * exe if side == "BUY" else +qty * exe
-                # state["cash"] += cash_change - stock_commission(qty)
-                state["position"]["RTM"] = current_rtm + (qty if side == "BUY" else -qty)
-                if state["position"]["RTM"] == 0:
-                    state["position"].pop("RTM", None)
\ No newline at end of file
+if __name__ == "__main__":
+    profiler.enable()
+    scheduler = TickScheduler(client)
+    scheduler.on_tick(on_tick)
+    scheduler.run()
+    print("tick-edge detection latency:", scheduler.latency_stats())
+    print(profiler.report())
+    print("iv service:", iv_service.stats())
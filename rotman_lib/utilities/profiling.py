@@ -0,0 +1,309 @@
+import io
+import time
+import heapq
+import pstats
+import cProfile
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullContext()
+
+
+class TickRecord:
+    """
+    Phase times of one tick. ``phases`` add up to ``total``; ``concurrent``
+    holds time spent in spans on other threads (e.g. order chunks on worker
+    threads), which overlaps the tick and is not part of the sum.
+    """
+
+    __slots__ = ("tick", "total", "phases", "concurrent")
+
+    def __init__(self, tick, total: float, phases: dict, concurrent: dict = None):
+        self.tick = tick
+        self.total = total
+        self.phases = phases
+        self.concurrent = concurrent or {}
+
+    def __repr__(self):
+        parts = ", ".join(f"{k}={v * 1e3:.2f}ms" for k, v in self.phases.items())
+        if self.concurrent:
+            parts += ", concurrent: " + ", ".join(
+                f"{k}={v * 1e3:.2f}ms" for k, v in self.concurrent.items()
+            )
+        return f"TickRecord(tick={self.tick}, total={self.total * 1e3:.2f}ms, {parts})"
+
+
+class _Span:
+    """Timed section; exclusive time is charged to ``name`` on exit."""
+
+    __slots__ = ("profiler", "name", "start", "child")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.child = 0.0
+            self.profiler._stack().append(self)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler.enabled:
+            self.profiler._close(self)
+        return False
+
+    def __call__(self, fn):
+        name, profiler = self.name, self.profiler
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            with _Span(profiler, name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+class TickProfiler:
+    """
+    Per-tick breakdown of where the trading loop spends its time.
+
+    Time is attributed to named phases in three ways, all of which can be
+    mixed:
+
+    * ``with profiler.span("order"):`` or ``@profiler.span("order")``;
+    * ``profiler.lap("analytics")``, which ends the previous lap of the tick
+      and starts a new one, for straight-line code;
+    * ``@profiled("order")``, a span on the module-level ``default_profiler``.
+
+    Phases record exclusive time: a span opened inside another one pauses
+    its parent, so per-tick phase times add up to the tick time. Spans are
+    tracked per thread. Only spans on the thread that runs the tick count
+    towards its phases; spans on other threads (route_order chunks fanned
+    out by place_legs, say) run inside a span of the tick thread that is
+    already charged the wall time, so they are summed separately as
+    TickRecord.concurrent and never added to the tick. A finished tick
+    becomes a TickRecord in a ring buffer of ``capacity`` ticks.
+
+    With ``sample_slowest=N`` every tick runs under cProfile and the profiles
+    of the N slowest ticks are kept (see slowest_profiles()). This costs far
+    more than the spans themselves and is meant for investigations only.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        enabled: bool = True,
+        sample_slowest: int = 0,
+    ):
+        """
+        :param capacity: Number of most recent ticks kept.
+        :param enabled: If False every span, lap and tick is a no-op.
+        :param sample_slowest: Keep cProfile output for this many slowest ticks.
+        """
+        self.enabled = enabled
+        self.sample_slowest = sample_slowest
+        self.records = deque(maxlen=capacity)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._phases = None  # phase -> seconds for the open tick
+        self._concurrent = None  # phase -> seconds on other threads, open tick
+        self._tick_thread = None
+        self._profiles = []  # min-heap of (total, seq, tick, pstats.Stats)
+        self._seq = 0
+
+    def enable(self, sample_slowest: Optional[int] = None):
+        if sample_slowest is not None:
+            self.sample_slowest = sample_slowest
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.records.clear()
+        self._profiles = []
+
+    ### spans
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _close(self, span: _Span):
+        elapsed = time.perf_counter() - span.start
+        stack = self._stack()
+        i = stack.index(span)
+        del stack[i]
+        if i > 0:
+            stack[i - 1].child += elapsed
+        phases = self._phases
+        if phases is None:
+            return
+        if threading.get_ident() != self._tick_thread:
+            phases = self._concurrent
+        with self._lock:
+            phases[span.name] = phases.get(span.name, 0.0) + elapsed - span.child
+
+    def span(self, name: str):
+        """Context manager / decorator timing a phase."""
+        return _Span(self, name)
+
+    def lap(self, name: str):
+        """Ends the current lap of this tick (if any) and starts ``name``."""
+        if not self.enabled:
+            return
+        current = getattr(self._local, "lap", None)
+        if current is not None:
+            self._close(current)
+        span = self._local.lap = _Span(self, name)
+        # laps sit below any span that is already open
+        span.child = 0.0
+        self._stack().insert(0, span)
+        span.start = time.perf_counter()
+
+    ### ticks
+
+    @contextmanager
+    def _tick(self, tick):
+        profile = None
+        if self.sample_slowest:
+            profile = cProfile.Profile()
+        self._phases = {}
+        self._concurrent = {}
+        self._tick_thread = threading.get_ident()
+        self._local.lap = None
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile is not None:
+                profile.disable()
+            lap = self._local.lap
+            if lap is not None:
+                self._close(lap)
+                self._local.lap = None
+            total = time.perf_counter() - start
+            with self._lock:
+                phases, self._phases = self._phases, None
+                concurrent, self._concurrent = self._concurrent, None
+            untracked = total - sum(phases.values())
+            if untracked > 0:
+                phases["other"] = phases.get("other", 0.0) + untracked
+            self.records.append(TickRecord(tick, total, phases, concurrent))
+            if profile is not None:
+                self._keep_profile(total, tick, profile)
+
+    def tick(self, tick=None):
+        """Context manager wrapping one tick of the loop."""
+        if not self.enabled:
+            return _NULL
+        return self._tick(tick)
+
+    def _keep_profile(self, total, tick, profile):
+        self._seq += 1
+        entry = (total, self._seq, tick, pstats.Stats(profile))
+        if len(self._profiles) < self.sample_slowest:
+            heapq.heappush(self._profiles, entry)
+        elif total > self._profiles[0][0]:
+            heapq.heapreplace(self._profiles, entry)
+
+    ### reporting
+
+    def summary(self, concurrent: bool = False):
+        """
+        Per-phase statistics over the buffered ticks, in milliseconds.
+
+        :param concurrent: Summarize the spans of other threads instead; their
+            share is relative to tick time and may exceed 100%.
+        :return: dict phase -> {mean, p50, p99, max, share}; "tick" is the whole tick.
+        """
+        records = list(self.records)
+        if not records:
+            return {}
+        field = "concurrent" if concurrent else "phases"
+        names = sorted({k for r in records for k in getattr(r, field)})
+        totals = np.array([r.total for r in records]) * 1e3
+        result = {}
+        for name, values in [("tick", totals)] + [
+            (n, np.array([getattr(r, field).get(n, 0.0) for r in records]) * 1e3)
+            for n in names
+        ]:
+            result[name] = {
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "max": float(values.max()),
+                "share": float(values.sum() / totals.sum()) if totals.sum() else 0.0,
+            }
+        return result
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return "no ticks profiled"
+        lines = [
+            f"{len(self.records)} ticks",
+            f"{'phase':<12s} {'mean':>9s} {'p50':>9s} {'p99':>9s} {'max':>9s} {'share':>7s}",
+        ]
+        for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["share"]):
+            lines.append(
+                f"{name:<12s} {s['mean']:9.3f} {s['p50']:9.3f} {s['p99']:9.3f} "
+                f"{s['max']:9.3f} {s['share']:7.1%}"
+            )
+        concurrent = self.summary(concurrent=True)
+        concurrent.pop("tick", None)
+        if concurrent:
+            lines.append("worker threads (overlap the phases above, not additive)")
+            for name, s in sorted(concurrent.items(), key=lambda kv: -kv[1]["share"]):
+                lines.append(
+                    f"{name:<12s} {s['mean']:9.3f} {s['p50']:9.3f} {s['p99']:9.3f} "
+                    f"{s['max']:9.3f} {s['share']:7.1%}"
+                )
+        return "\n".join(lines)
+
+    def slowest(self, n: int = 10):
+        return sorted(self.records, key=lambda r: -r.total)[:n]
+
+    def slowest_profiles(self):
+        """(total seconds, tick, pstats.Stats) for the sampled slowest ticks."""
+        return [(t, tick, stats) for t, _, tick, stats in sorted(self._profiles)[::-1]]
+
+    def print_slowest_profiles(self, lines: int = 15, sort: str = "cumulative"):
+        out = io.StringIO()
+        for total, tick, stats in self.slowest_profiles():
+            out.write(f"--- tick {tick}: {total * 1e3:.2f} ms ---\n")
+            stats.stream = out
+            stats.sort_stats(sort).print_stats(lines)
+        print(out.getvalue())
+
+
+default_profiler = TickProfiler(enabled=False)
+
+
+def profiled(name: str):
+    """Decorator charging the wrapped function's time to ``default_profiler``."""
+    return default_profiler.span(name)